@@ -0,0 +1,281 @@
+import streamlit as st
+
+from sales_data import (
+    MARGIN_BUCKETS,
+    MONTHS,
+    VarianceEngine,
+    effect_totals,
+    filter_key,
+    get_cube,
+    get_filter_engine,
+    get_item_search,
+    get_logistics_data,
+    get_monthly_data,
+    get_result_cache,
+    get_search_runner,
+    get_sort_index,
+    key_insights,
+    month_over_month,
+    summarize,
+    top_movers,
+)
+from sales_data.config import ADMIN_PASSWORD
+from sales_data.live_search import DEBOUNCE, PREVIEW_ROWS, checkpoint
+from sales_data.profiling import stage, start_profile
+from sales_data.ui import live_search_result, paged_dataframe, profile_panel
+
+# ===============================
+# CONFIGURATION
+# ===============================
+st.set_page_config(page_title="Sales & Profit Dashboard", layout="wide")
+
+# ===============================
+# PASSWORD PROTECTION
+# ===============================
+if "authenticated" not in st.session_state:
+    st.session_state.authenticated = False
+
+if not st.session_state.authenticated:
+    st.title("🔒 Sales & Profit Dashboard")
+    password = st.text_input("Enter Password to Continue", type="password")
+    if st.button("Login"):
+        if password == "123123":
+            st.session_state.authenticated = True
+            st.rerun()
+        elif ADMIN_PASSWORD and password == ADMIN_PASSWORD:
+            st.session_state.authenticated = st.session_state.admin = True
+            st.rerun()
+        else:
+            st.error("❌ Incorrect password. Try again.")
+    st.stop()
+
+# Stage timings of this run (SALES_PROFILE=1), shown to admins at the end
+profile = start_profile("logistics")
+
+# ===============================
+# MONTH SELECTION
+# ===============================
+# Months are read on first use only
+st.sidebar.header("📅 Month")
+selected_month = st.sidebar.selectbox("Select Month", MONTHS, index=len(MONTHS) - 1)
+month_index = MONTHS.index(selected_month)
+previous_month = MONTHS[month_index - 1] if month_index > 0 else None
+compare = previous_month is not None and st.sidebar.toggle(
+    f"Compare with {previous_month}", value=True
+)
+
+# ===============================
+# LOAD DATA
+# ===============================
+with stage("load"):
+    data = get_logistics_data(selected_month)
+for file in data.missing:
+    st.warning(f"⚠️ File not found: {file}")
+for error in data.errors.values():
+    st.error(f"❌ Skipped malformed file: {error}")
+df = data.data
+
+# ===============================
+# SIDEBAR FILTERS
+# ===============================
+st.sidebar.header("🔍 Filters")
+
+# Category Filter
+categories = ["All"] + sorted(df["Category"].unique().tolist())
+selected_category = st.sidebar.selectbox("Select Category", categories)
+
+# Exclude Categories Filter (multi-select)
+exclude_categories = st.sidebar.multiselect("Exclude Categories", options=df["Category"].unique())
+
+# Outlet Filter
+outlets = ["All"] + sorted(df["Outlet"].unique().tolist())
+selected_outlet = st.sidebar.selectbox("Select Outlet", outlets)
+
+# Margin Filter (non-overlapping)
+margin_filters = ["All"] + list(MARGIN_BUCKETS)
+selected_margin = st.sidebar.selectbox("Select Margin Range (%)", margin_filters)
+
+# Search as you type: the box commits after a pause and searches in the background
+live_search = st.sidebar.toggle("⚡ Search as you type")
+live_typing = DEBOUNCE if live_search else False
+
+# Data freshness
+with st.sidebar.expander("🕒 Last Refreshed"):
+    for outlet, refreshed in data.refreshed.items():
+        report = data.reports[outlet]
+        st.caption(
+            f"{outlet}: {refreshed:%d %b %Y %H:%M} · {report.rows:,} rows, {report.rejected:,} rejected"
+        )
+
+# ===============================
+# APPLY FILTERS
+# ===============================
+selection = dict(
+    category=selected_category,
+    exclude=exclude_categories,
+    outlet=selected_outlet,
+    margin=selected_margin,
+)
+with stage("filter"):
+    filtered_df = get_filter_engine(df).apply(**selection)
+
+# ===============================
+# SEARCH BAR
+# ===============================
+st.title(f"📊 Sales & Profit Insights ({selected_month})")
+
+search_term = st.text_input(
+    "🔎 Search Item Name", placeholder="Type an item name...", live=live_typing, key="search_term"
+)
+
+# Aggregates below are cached per filter state, shared across sessions
+# and answered from the pre-aggregated cube unless an item search is active
+with stage("aggregate"):
+    results = get_result_cache(df)
+    cube = get_cube(df)
+searching = bool(search_term)
+view = filter_key(selected_category, exclude_categories, selected_outlet, selected_margin, search_term)
+item_search = get_item_search(df)
+
+# Both months as one frame with a Month column, for the comparison
+if compare:
+    with stage("load"):
+        monthly = get_monthly_data([previous_month, selected_month])
+
+
+def monthly_view():
+    """Both months' rows matching the sidebar selection and search."""
+    monthly_filtered = get_filter_engine(monthly).apply(**selection)
+    if search_term:
+        monthly_filtered = get_item_search(monthly).filter(monthly_filtered, "Items", search_term)
+    return monthly_filtered
+
+
+def compare_months():
+    """Month-over-month table of the view, or None without a comparison."""
+    if not compare:
+        return None
+    return get_result_cache(monthly).get_or_compute(
+        ("mom", previous_month, selected_month) + view,
+        lambda: month_over_month(monthly_view(), previous_month, selected_month),
+    )
+
+
+def month_movers():
+    """Effect totals and top movers of the selected month against the previous one."""
+    def compute():
+        table = VarianceEngine(monthly_view(), by="Month").compare(previous_month, selected_month)
+        return effect_totals(table), top_movers(table)
+
+    return get_result_cache(monthly).get_or_compute(("movers", previous_month, selected_month) + view, compute)
+
+
+def run_search(job=None):
+    """Rows, key insights, outlet summary and month-over-month table of the searched view."""
+    rows = item_search.filter(filtered_df, "Items", search_term)
+    checkpoint(job)
+    insights = results.get_or_compute(("insights",) + view, lambda: key_insights(rows))
+    checkpoint(job)
+    outlets = results.get_or_compute(
+        ("outlet_items",) + view, lambda: summarize(rows, by=["Outlet", "Item Code"])
+    )
+    checkpoint(job)
+    return rows, insights, outlets, compare_months()
+
+
+with stage("search" if searching else "aggregate"):
+    if not searching:
+        insights = results.get_or_compute(("insights",) + view, lambda: cube.insights(**selection))
+        outlet_summary = results.get_or_compute(
+            ("outlet_items",) + view, lambda: cube.summarize(by=["Outlet", "Item Code"], **selection)
+        )
+        mom = compare_months()
+    elif live_search:
+        searched = live_search_result(
+            get_search_runner(df),
+            ("logistics", selected_month, compare) + view,
+            run_search,
+            lambda: item_search.preview(filtered_df, [("Items", search_term)], PREVIEW_ROWS),
+            ["Item Code", "Outlet", "Category", "Items", "Total Sales", "Total Profit", "Margin %"],
+        )
+        if searched is None:
+            profile_panel(profile)
+            st.stop()
+        filtered_df, insights, outlet_summary, mom = searched
+    else:
+        filtered_df, insights, outlet_summary, mom = run_search()
+
+# ===============================
+# KEY INSIGHTS
+# ===============================
+if not filtered_df.empty:
+    total_sales, total_profit, avg_margin = insights
+    deltas = [None, None, None]
+    if compare:
+        prev_sales = mom[f"Total Sales ({previous_month})"].sum()
+        prev_profit = mom[f"Total Profit ({previous_month})"].sum()
+        prev_margin = (prev_profit / prev_sales * 100) if prev_sales > 0 else 0
+        deltas = [
+            f"{total_sales - prev_sales:,.2f} vs {previous_month}",
+            f"{total_profit - prev_profit:,.2f} vs {previous_month}",
+            f"{avg_margin - prev_margin:.2f} pts vs {previous_month}",
+        ]
+
+    st.subheader("📈 Key Insights")
+    c1, c2, c3 = st.columns(3)
+    c1.metric("💰 Total Sales", f"{total_sales:,.2f}", deltas[0])
+    c2.metric("📊 Total Profit", f"{total_profit:,.2f}", deltas[1])
+    c3.metric("⚙️ Avg. Margin %", f"{avg_margin:.2f}%", deltas[2])
+else:
+    st.warning("No data found for the selected filters or search term.")
+
+# ===============================
+# MONTH-OVER-MONTH
+# ===============================
+if compare and not mom.empty:
+    st.subheader(f"📆 {selected_month} vs {previous_month} by Category")
+    with stage("render"):
+        st.dataframe(mom, use_container_width=True, height=350)
+
+    # Items aligned on Item Code across the two months, with the profit
+    # change split into volume, mix and margin effects
+    st.subheader(f"🚀 Top Movers, {selected_month} vs {previous_month}")
+    with stage("aggregate"):
+        effects, movers = month_movers()
+    e1, e2, e3, e4 = st.columns(4)
+    e1.metric("Δ Profit", f"{effects['Δ Profit']:,.2f}")
+    e2.metric("📦 Volume Effect", f"{effects['Volume Effect']:,.2f}")
+    e3.metric("🔀 Mix Effect", f"{effects['Mix Effect']:,.2f}")
+    e4.metric("⚙️ Margin Effect", f"{effects['Margin Effect']:,.2f}")
+    with stage("render"):
+        st.dataframe(movers, use_container_width=True, height=400)
+
+# ===============================
+# ITEM-WISE DETAILS
+# ===============================
+st.subheader("📋 Item-wise Sales, Profit & Margin")
+
+if not filtered_df.empty:
+    with stage("render"):
+        paged_dataframe(
+            df,
+            filtered_df,
+            ["Item Code", "Outlet", "Category", "Items", "Total Sales", "Total Profit", "Margin %"],
+            get_sort_index(df),
+            sort_by="Margin %",
+            ascending=True,
+            key="items",
+        )
+
+# ===============================
+# OUTLET-WISE TOTALS
+# ===============================
+st.subheader("🏪 Outlet-wise Total Sales, Profit & Avg Margin")
+
+if not filtered_df.empty:
+    with stage("render"):
+        st.dataframe(outlet_summary, use_container_width=True, height=350)
+else:
+    st.info("No outlet data to display.")
+
+profile_panel(profile)
@@ -0,0 +1,95 @@
+from sales_data.aggregates import (
+    key_insights,
+    margin_buckets,
+    month_over_month,
+    summarize,
+    top_products,
+)
+from sales_data.cleaning import (
+    SchemaError,
+    ValidationReport,
+    compact_sales_data,
+    validate_sales_data,
+)
+from sales_data.config import LOGISTICS_MONTH_FILES, MARGIN_BUCKETS, MONTHS, OUTLET_FILES
+from sales_data.cube import SalesCube
+from sales_data.filters import FilterEngine, margin_bucket_codes
+from sales_data.loader import LoadResult, load_outlet_files, load_outlet_frames
+from sales_data.paging import SortIndex, page_bounds
+from sales_data.query import DuckQuery
+from sales_data.results import ResultCache, filter_key
+from sales_data.search_index import ColumnIndex, FuzzyIndex, ItemSearch, normalize_name
+from sales_data.sku import SkuMaster
+from sales_data.snapshot import read_snapshot, snapshot_is_stale
+from sales_data.store import (
+    clear_cache,
+    derived,
+    get_cube,
+    get_dataset,
+    get_figure_cache,
+    get_filter_engine,
+    get_item_search,
+    get_logistics_data,
+    get_monthly_data,
+    get_outlet_data,
+    get_query,
+    get_result_cache,
+    get_search_runner,
+    get_sku_master,
+    get_sort_index,
+    get_variance_engine,
+)
+from sales_data.variance import VarianceEngine, effect_totals, top_movers
+
+__all__ = [
+    "ColumnIndex",
+    "DuckQuery",
+    "FilterEngine",
+    "FuzzyIndex",
+    "ItemSearch",
+    "LOGISTICS_MONTH_FILES",
+    "LoadResult",
+    "MARGIN_BUCKETS",
+    "MONTHS",
+    "OUTLET_FILES",
+    "ResultCache",
+    "SalesCube",
+    "SchemaError",
+    "SkuMaster",
+    "SortIndex",
+    "ValidationReport",
+    "VarianceEngine",
+    "clear_cache",
+    "compact_sales_data",
+    "derived",
+    "effect_totals",
+    "filter_key",
+    "get_cube",
+    "get_dataset",
+    "get_figure_cache",
+    "get_filter_engine",
+    "get_item_search",
+    "get_logistics_data",
+    "get_monthly_data",
+    "get_outlet_data",
+    "get_query",
+    "get_result_cache",
+    "get_search_runner",
+    "get_sku_master",
+    "get_sort_index",
+    "get_variance_engine",
+    "key_insights",
+    "load_outlet_files",
+    "load_outlet_frames",
+    "margin_bucket_codes",
+    "margin_buckets",
+    "month_over_month",
+    "normalize_name",
+    "page_bounds",
+    "read_snapshot",
+    "snapshot_is_stale",
+    "summarize",
+    "top_movers",
+    "top_products",
+    "validate_sales_data",
+]
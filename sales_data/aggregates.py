@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from sales_data.config import MARGIN_BUCKETS
+from sales_data.filters import margin_bucket_codes
+
+
+# ===============================
+# SUMMARY AGGREGATES
+# ===============================
+def key_insights(df):
+    """(total sales, total profit, margin %) of ``df``."""
+    total_sales = df["Total Sales"].sum()
+    total_profit = df["Total Profit"].sum()
+    avg_margin = (total_profit / total_sales * 100) if total_sales > 0 else 0
+    return total_sales, total_profit, avg_margin
+
+
+def summarize(df, by="Outlet", margin_column="Avg Margin %"):
+    """Sales and profit summed per ``by``, largest sales first."""
+    summary = (
+        df.groupby(by, observed=True)
+        .agg({"Total Sales": "sum", "Total Profit": "sum"})
+        .reset_index()
+    )
+    # Correct avg margin using total profit/total sales
+    summary[margin_column] = (summary["Total Profit"] / summary["Total Sales"] * 100).round(2)
+    return summary.sort_values("Total Sales", ascending=False)
+
+
+def top_products(df, n=30):
+    """The ``n`` best-selling items of ``df`` with their GP%."""
+    top = (
+        df.groupby("Items", observed=True)
+        .agg({"Total Sales": "sum", "Total Profit": "sum"})
+        .nlargest(n, "Total Sales")
+        .reset_index()
+    )
+    top["GP%"] = (top["Total Profit"] / top["Total Sales"] * 100).round(2)
+    return top
+
+
+def month_over_month(df, previous, current, by="Category"):
+    """Sales and profit of ``current`` next to ``previous`` per ``by``, with deltas.
+
+    ``df`` holds both months in an ordered ``Month`` column.
+    """
+    months = df[df["Month"].isin([previous, current])]
+    if months.empty:
+        # pivot_table of no rows has no measure columns to look up
+        keys = [by] if isinstance(by, str) else list(by)
+        columns = list(keys)
+        for measure in ["Total Sales", "Total Profit"]:
+            columns += [f"{measure} ({previous})", f"{measure} ({current})", f"Δ {measure}"]
+        return pd.DataFrame(columns=columns + ["Δ Sales %"])
+    pivot = months.pivot_table(index=by, columns="Month", values=["Total Sales", "Total Profit"],
+                               aggfunc="sum", fill_value=0, observed=True)
+    table = pd.DataFrame(index=pivot.index)
+    for measure in ["Total Sales", "Total Profit"]:
+        before = pivot[measure][previous] if previous in pivot[measure] else 0
+        after = pivot[measure][current] if current in pivot[measure] else 0
+        table[f"{measure} ({previous})"] = before
+        table[f"{measure} ({current})"] = after
+        table[f"Δ {measure}"] = (after - before).round(2)
+    before = table[f"Total Sales ({previous})"]
+    table["Δ Sales %"] = (table["Δ Total Sales"] / before.where(before != 0) * 100).round(2)
+    return table.reset_index().sort_values("Δ Total Sales", key=abs, ascending=False)
+
+
+def margin_buckets(df, by=None):
+    """Item count, sales and profit per sidebar margin range, optionally per ``by``.
+
+    Every range is listed, empty ones included, for each ``by`` key that
+    occurs in ``df`` (not for every category of a categorical key).
+    """
+    keys = [by] if isinstance(by, str) else list(by or [])
+    labels = list(MARGIN_BUCKETS)
+    ranges = pd.Categorical.from_codes(margin_bucket_codes(df["Margin %"]), categories=labels)
+    table = (
+        df.assign(**{"Margin Range": ranges})
+        .groupby(keys + ["Margin Range"], observed=bool(keys))
+        .agg(**{
+            "Item Count": ("Total Sales", "size"),
+            "Total Sales": ("Total Sales", "sum"),
+            "Total Profit": ("Total Profit", "sum"),
+        })
+    )
+    if keys:
+        # Observed keys x every range
+        observed = table.index.droplevel("Margin Range").unique().to_frame(index=False)
+        full = observed.loc[observed.index.repeat(len(labels))].reset_index(drop=True)
+        full["Margin Range"] = pd.Categorical.from_codes(np.tile(np.arange(len(labels)), len(observed)), labels)
+        table = (
+            table.reindex(pd.MultiIndex.from_frame(full), fill_value=0)
+            .astype({"Item Count": "int64"})
+        )
+    return table.reset_index()
@@ -0,0 +1,434 @@
+"""Serve the consolidated sales data over a read-only local HTTP API.
+
+    python -m sales_data.api
+    python -m sales_data.api --host 0.0.0.0 --port 8600 --quiet
+
+    curl 'http://127.0.0.1:8600/rows?outlet=Hilal&margin=10+-+20&limit=100'
+    curl 'http://127.0.0.1:8600/summary?dataset=Oct&by=Category'
+    curl -H 'Accept: application/vnd.apache.arrow.stream' http://127.0.0.1:8600/rows > rows.arrows
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from sales_data.aggregates import key_insights, margin_buckets, summarize, top_products
+from sales_data.config import MARGIN_BUCKETS, MONTHS
+from sales_data.paging import SORTABLE_COLUMNS
+from sales_data.results import filter_key
+from sales_data.search_index import REGEX_CHARS
+from sales_data.store import (
+    get_cube,
+    get_filter_engine,
+    get_item_search,
+    get_logistics_data,
+    get_outlet_data,
+    get_query,
+    get_result_cache,
+    get_sort_index,
+    use_duckdb,
+)
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow responses are optional
+    pa = None
+
+# ===============================
+# READ-ONLY HTTP API
+# ===============================
+# The same loader, cleaning, filter, search and aggregate code as the
+# dashboards, answering GET requests without Streamlit. Every request
+# goes through the store, so edited workbooks are picked up exactly as on
+# the pages, and the indexes and result cache built for a loaded frame
+# are shared with any page running in the same process.
+#
+# Connections are HTTP/1.1 keep-alive. Tables are sent with chunked
+# transfer encoding, BATCH_ROWS rows at a time, as JSON records (the
+# default), CSV or an Arrow IPC stream (?format=arrow, or an Accept
+# header asking for it) so a large export never sits whole in memory as
+# text. Selection parameters mirror the sidebar: category, exclude
+# (repeatable), outlet, margin, plus the item search and code boxes.
+# Float columns go out as float64 rounded to the two decimals the pages
+# show, so float32 margins and summed amounts carry no binary noise.
+BATCH_ROWS = 5000
+DECIMALS = 2
+DEFAULT_PORT = 8600
+TOP_PRODUCTS = 30
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+CONTENT_TYPES = {"json": "application/json", "csv": "text/csv; charset=utf-8", "arrow": ARROW_TYPE}
+GROUP_COLUMNS = ["Outlet", "Category", "Items", "Item Code"]
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def default_datasets():
+    """{dataset name: loader returning a LoadResult}: 'outlets' and each logistics month."""
+    datasets = {"outlets": get_outlet_data}
+    for month in MONTHS:
+        datasets[month] = lambda month=month: get_logistics_data(month)
+    return datasets
+
+
+class Params:
+    """Query-string access with the API's defaults and validation."""
+
+    def __init__(self, query):
+        self.values = parse_qs(query, keep_blank_values=True)
+
+    def get(self, name, default=None):
+        values = self.values.get(name)
+        return values[-1] if values and values[-1] != "" else default
+
+    def all(self, name):
+        return [v for value in self.values.get(name, []) for v in value.split(",") if v]
+
+    def int(self, name, default, low=0, high=None):
+        value = self.get(name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise ApiError(f"{name} must be an integer, got {value!r}") from None
+        if number < low or (high is not None and number > high):
+            raise ApiError(f"{name} must be between {low} and {high if high is not None else 'any'}")
+        return number
+
+    def choice(self, name, choices, default):
+        value = self.get(name, default)
+        if value not in choices:
+            raise ApiError(f"{name} must be one of {', '.join(map(str, choices))}, got {value!r}")
+        return value
+
+    def selection(self):
+        margin = self.get("margin", "All")
+        if margin != "All" and margin not in MARGIN_BUCKETS:
+            raise ApiError(f"margin must be All or one of {', '.join(MARGIN_BUCKETS)}, got {margin!r}")
+        return {
+            "category": self.get("category", "All"),
+            "exclude": self.all("exclude"),
+            "outlet": self.get("outlet", "All"),
+            "margin": margin,
+        }
+
+    def searches(self):
+        return {"search": self.get("search"), "code": self.get("code")}
+
+    def group_by(self, default):
+        by = self.all("by") or [default]
+        unknown = [column for column in by if column not in GROUP_COLUMNS]
+        if unknown:
+            raise ApiError(f"by must be among {', '.join(GROUP_COLUMNS)}, got {', '.join(unknown)}")
+        return by[0] if len(by) == 1 else by
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SalesDataAPI/1.0"
+    # Headers and body go out as separate writes; without this, Nagle's
+    # algorithm and delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    # ----------- dispatch -----------
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = ROUTES.get(url.path.rstrip("/") or "/")
+        self.responding = False
+        try:
+            if route is None:
+                raise ApiError(f"No such endpoint: {url.path}", 404)
+            route(self, Params(url.query))
+        except ApiError as exc:
+            self.send_json({"error": str(exc)}, exc.status)
+        except Exception as exc:
+            self.log_error("%s failed: %s: %s", self.path, type(exc).__name__, exc)
+            traceback.print_exc()
+            if self.responding:
+                # Part of the response is out; the client sees a cut-off body
+                self.close_connection = True
+            else:
+                self.send_json({"error": f"Internal error: {type(exc).__name__}: {exc}"}, 500)
+
+    def send_response(self, code, message=None):
+        self.responding = True
+        super().send_response(code, message)
+
+    def log_request(self, code="-", size="-"):
+        if not self.server.quiet:
+            super().log_request(code, size)
+
+    # ----------- data -----------
+    def dataset(self, params):
+        names = list(self.server.datasets)
+        name = params.choice("dataset", names, names[0])
+        loaded = self.server.datasets[name]()
+        if loaded.data.empty:
+            raise ApiError(f"No data loaded for {name}", 503)
+        return loaded
+
+    def view(self, df, params):
+        """Rows of ``df`` matching the sidebar selection and searches, positional labels kept."""
+        rows = get_filter_engine(df).apply(**params.selection())
+        for column, term in (("Items", params.get("search")), ("Item Code", params.get("code"))):
+            if term:
+                _check_pattern(term)
+                rows = get_item_search(df).filter(rows, column, term)
+        return rows
+
+    def cached(self, df, name, params, compute):
+        shape = tuple((k, tuple(params.values.get(k, ()))) for k in ("by", "n"))
+        key = ("api", name) + filter_key(**params.selection(), **params.searches()) + shape
+        return get_result_cache(df).get_or_compute(key, compute)
+
+    # ----------- responses -----------
+    def response_format(self, params):
+        fmt = params.get("format")
+        if fmt is None:
+            fmt = "arrow" if ARROW_TYPE in self.headers.get("Accept", "") else "json"
+        if fmt not in CONTENT_TYPES:
+            raise ApiError(f"format must be one of {', '.join(CONTENT_TYPES)}, got {fmt!r}")
+        if fmt == "arrow" and pa is None:
+            raise ApiError("Arrow responses need the pyarrow package", 406)
+        return fmt
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", CONTENT_TYPES["json"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_table(self, frame, fmt, headers=None):
+        """Stream ``frame`` in ``fmt`` as chunked batches of BATCH_ROWS rows."""
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES[fmt])
+        self.send_header("Transfer-Encoding", "chunked")
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        chunks = _ChunkedWriter(self.wfile)
+        floats = frame.select_dtypes("floating").columns
+        frame = frame.reset_index(drop=True).astype({col: "float64" for col in floats}).round(DECIMALS)
+        if fmt == "arrow":
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            with pa.ipc.new_stream(chunks, table.schema) as writer:
+                for batch in table.to_batches(max_chunksize=BATCH_ROWS):
+                    writer.write_batch(batch)
+        else:
+            if fmt == "json":
+                chunks.write(b"[")
+            for start in range(0, len(frame), BATCH_ROWS):
+                batch = frame.iloc[start:start + BATCH_ROWS]
+                if fmt == "csv":
+                    text = batch.to_csv(index=False, header=start == 0)
+                else:
+                    text = ("," if start else "") + batch.to_json(orient="records", double_precision=DECIMALS)[1:-1]
+                chunks.write(text.encode("utf-8"))
+            if fmt == "csv" and frame.empty:
+                chunks.write(frame.to_csv(index=False).encode("utf-8"))
+            if fmt == "json":
+                chunks.write(b"]")
+        chunks.close()
+
+    # ----------- endpoints -----------
+    def index(self, params):
+        self.send_json({"endpoints": sorted(ROUTES), "datasets": list(self.server.datasets)})
+
+    def datasets(self, params):
+        listing = []
+        for name, load in self.server.datasets.items():
+            loaded = load()
+            listing.append({
+                "dataset": name,
+                "rows": len(loaded.data),
+                "files": list(loaded.timings),
+                "missing": loaded.missing,
+                "errors": loaded.errors or {},
+                "refreshed": {o: t.isoformat(timespec="seconds") for o, t in loaded.refreshed.items()},
+            })
+        self.send_json(listing)
+
+    def rows(self, params):
+        df = self.dataset(params).data
+        fmt = self.response_format(params)
+        rows = self.view(df, params)
+        positions = rows.index.to_numpy()
+        sort = params.get("sort")
+        if sort is not None:
+            if sort not in SORTABLE_COLUMNS:
+                raise ApiError(f"sort must be one of {', '.join(SORTABLE_COLUMNS)}, got {sort!r}")
+            ascending = params.choice("order", ["asc", "desc"], "desc") == "asc"
+            positions = get_sort_index(df).sorted_rows(positions, sort, ascending)
+        offset = params.int("offset", 0)
+        limit = params.int("limit", len(positions))
+        page = positions[offset:offset + limit]
+        self.send_table(df.take(page), fmt, {"X-Total-Rows": len(positions)})
+
+    def insights(self, params):
+        df = self.dataset(params).data
+        if any(params.searches().values()):
+            sales, profit, margin = key_insights(self.view(df, params))
+        else:
+            sales, profit, margin = get_cube(df).insights(**params.selection())
+        totals = {"Total Sales": sales, "Total Profit": profit, "Margin %": margin}
+        self.send_json({name: round(float(value), DECIMALS) for name, value in totals.items()})
+
+    def summary(self, params):
+        df = self.dataset(params).data
+        fmt = self.response_format(params)
+        by = params.group_by("Outlet")
+
+        def compute():
+            if not any(params.searches().values()):
+                try:
+                    return get_cube(df).summarize(by=by, **params.selection())
+                except KeyError:
+                    pass  # no rollup holds these columns, e.g. Items with Item Code
+            return summarize(self.view(df, params), by=by)
+
+        self.send_table(self.cached(df, "summary", params, compute), fmt)
+
+    def margin_ranges(self, params):
+        df = self.dataset(params).data
+        fmt = self.response_format(params)
+        by = params.all("by")
+        if set(by) - set(GROUP_COLUMNS):
+            raise ApiError(f"by must be among {', '.join(GROUP_COLUMNS)}")
+
+        def compute():
+            if use_duckdb():
+                searches = params.searches()
+                for term in filter(None, searches.values()):
+                    _check_pattern(term)
+                return get_query(df).margin_buckets(by=by, **params.selection(), **searches)
+            return margin_buckets(self.view(df, params), by=by)
+
+        self.send_table(self.cached(df, "margin_buckets", params, compute), fmt)
+
+    def top(self, params):
+        df = self.dataset(params).data
+        fmt = self.response_format(params)
+        n = params.int("n", TOP_PRODUCTS, low=1, high=1000)
+
+        def compute():
+            if any(params.searches().values()):
+                return top_products(self.view(df, params), n)
+            return get_cube(df).top_products(n, **params.selection())
+
+        self.send_table(self.cached(df, "top_products", params, compute), fmt)
+
+    def search(self, params):
+        df = self.dataset(params).data
+        fmt = self.response_format(params)
+        term = params.get("q")
+        if term is None:
+            raise ApiError("q is required")
+        k = params.int("k", 20, low=1, high=500)
+        ranked = get_item_search(df).ranked(term, k).drop(columns="name_id")
+        self.send_table(ranked, fmt)
+
+
+ROUTES = {
+    "/": ApiHandler.index,
+    "/datasets": ApiHandler.datasets,
+    "/rows": ApiHandler.rows,
+    "/insights": ApiHandler.insights,
+    "/summary": ApiHandler.summary,
+    "/margin-buckets": ApiHandler.margin_ranges,
+    "/top-products": ApiHandler.top,
+    "/search": ApiHandler.search,
+}
+
+
+class _ChunkedWriter:
+    """File-like sink writing HTTP/1.1 chunks (also what pyarrow writes to)."""
+
+    closed = False
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, data):
+        data = bytes(data)
+        if data:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        return len(data)
+
+    def flush(self):
+        self.wfile.flush()
+
+    def close(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def _check_pattern(term):
+    # Terms with regex syntax are matched as regexes (see ColumnIndex)
+    if REGEX_CHARS & set(term):
+        try:
+            re.compile(term)
+        except re.error as exc:
+            raise ApiError(f"Invalid search pattern {term!r}: {exc}") from None
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serialisable: {type(value).__name__}")
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, datasets=None, quiet=False):
+        super().__init__(address, ApiHandler)
+        self.datasets = datasets or default_datasets()
+        self.quiet = quiet
+
+
+def serve_in_thread(datasets=None, host="127.0.0.1", port=0, quiet=True):
+    """Start an ApiServer on a background thread; returns it (``server_address`` has the port)."""
+    server = ApiServer((host, port), datasets, quiet)
+    threading.Thread(target=server.serve_forever, name="sales-api", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args(argv)
+
+    server = ApiServer((args.host, args.port), quiet=args.quiet)
+    start = time.perf_counter()
+    for name, load in server.datasets.items():
+        loaded = load()
+        for file in loaded.missing:
+            print(f"File not found: {file}", file=sys.stderr)
+        print(f"{name}: {len(loaded.data):,} rows", file=sys.stderr)
+    print(f"Loaded in {time.perf_counter() - start:.2f}s; serving on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
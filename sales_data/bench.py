@@ -0,0 +1,307 @@
+"""Time the data pipeline on synthetic outlet workbooks of growing size.
+
+    python -m sales_data.bench
+    python -m sales_data.bench --outlets 16 50 --rows 2000 --out bench.json
+    python -m sales_data.bench --compare bench-results.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from sales_data import api, query
+from sales_data.aggregates import summarize, top_products
+from sales_data.cleaning import compact_sales_data, validate_sales_data
+from sales_data.config import INGEST_COLUMNS
+from sales_data.cube import SalesCube
+from sales_data.filters import FilterEngine
+from sales_data.loader import LoadResult, load_outlet_files
+from sales_data.search_index import ItemSearch
+from sales_data.variance import NETWORK, VarianceEngine, top_movers
+
+# ===============================
+# SYNTHETIC WORKBOOKS
+# ===============================
+# Workbooks mimic the real exports: one row per item sold at the outlet,
+# drawn from a shared catalogue with a skewed popularity so that the
+# same items recur across outlets, a few rows without a Category and the
+# odd non-numeric measure. Outlet i is generated from (seed, i) alone, so
+# the 16-outlet set is a prefix of the 200-outlet one and workbooks are
+# reused between runs.
+CATEGORIES = 33
+CATALOGUE_ITEMS = 60000
+ROWS_PER_OUTLET = 10000
+SYLLABLES = ["ba", "ko", "ri", "ma", "te", "lu", "san", "dor", "vi", "na", "pe", "zo", "kar", "mi", "tu", "lo"]
+SIZES = ["100G", "250G", "500G", "1KG", "330ML", "500ML", "1.5L", "12S", "PCS"]
+
+
+def make_catalogue(items=CATALOGUE_ITEMS, seed=0):
+    """The shared item catalogue: Category, Items, Item Code and a popularity weight."""
+    rng = np.random.default_rng(seed)
+    words = np.array(sorted({
+        "".join(rng.choice(SYLLABLES, size=rng.integers(2, 4))).upper() for _ in range(3000)
+    }))
+    categories = np.array([f"CATEGORY {i:02d}" for i in range(CATEGORIES)])
+    names = [
+        " ".join(rng.choice(words, size=rng.integers(2, 5))) + " " + rng.choice(SIZES)
+        for _ in range(items)
+    ]
+    return pd.DataFrame({
+        "Category": categories[np.minimum(rng.zipf(1.6, items) - 1, CATEGORIES - 1)],
+        "Items": names,
+        "Item Code": rng.choice(10 ** 12, size=items, replace=False) + 10 ** 6,
+        "Weight": 1.0 / np.arange(1, items + 1) ** 0.8,
+    })
+
+
+def outlet_rows(catalogue, outlet, rows=ROWS_PER_OUTLET, seed=0):
+    """Rows of synthetic outlet ``outlet``, as lists ready for a worksheet."""
+    rng = np.random.default_rng((seed, outlet))
+    rows = min(rows, len(catalogue))
+    # Weighted sample without replacement (Gumbel top-k)
+    keys = np.log(catalogue["Weight"].to_numpy()) + rng.gumbel(size=len(catalogue))
+    picked = catalogue.iloc[np.argpartition(-keys, rows - 1)[:rows]]
+
+    sales = np.round(rng.lognormal(3.5, 1.3, rows) * np.where(rng.random(rows) < 0.01, -1, 1), 2)
+    profit = np.round(sales * rng.normal(20, 12, rows) / 100, 4)
+    category = picked["Category"].to_numpy(dtype=object)
+    category[rng.random(rows) < 0.005] = None
+    codes = picked["Item Code"].to_numpy(dtype=object)
+    as_text = rng.random(rows) < 0.05
+    codes[as_text] = [str(code) for code in codes[as_text]]
+    sales = sales.astype(object)
+    sales[rng.random(rows) < 0.001] = "-"
+
+    columns = {"Category": category, "Items": picked["Items"].to_numpy(), "Item Code": codes,
+               "Total Sales": sales, "Total Profit": profit}
+    return zip(*(columns[name].tolist() for name in INGEST_COLUMNS))
+
+
+def write_outlet_workbooks(directory, outlets, rows=ROWS_PER_OUTLET, seed=0):
+    """{outlet name: path} of ``outlets`` synthetic workbooks, writing the missing ones."""
+    os.makedirs(directory, exist_ok=True)
+    files = {f"Outlet {i:03d}": os.path.join(directory, f"outlet_{i:03d}.xlsx") for i in range(outlets)}
+    catalogue = None
+    for i, path in enumerate(files.values()):
+        if os.path.exists(path):
+            continue
+        if catalogue is None:
+            catalogue = make_catalogue(seed=seed)
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(INGEST_COLUMNS)
+        for row in outlet_rows(catalogue, i, rows, seed):
+            sheet.append(row)
+        workbook.save(path + ".tmp")
+        os.replace(path + ".tmp", path)
+    return files
+
+
+# ===============================
+# TIMED STAGES
+# ===============================
+def _timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _each(fn, args):
+    return lambda: [fn(arg) for arg in args]
+
+
+def bench_dataset(files, snapshot_dir, repeat=5):
+    """[(stage, [seconds])] for one set of outlet workbooks, plus the loaded frame."""
+    shutil.rmtree(snapshot_dir, ignore_errors=True)
+    results = []
+
+    start = time.perf_counter()
+    loaded = load_outlet_files(files, snapshot_dir=snapshot_dir)
+    results.append(("load_cold", [time.perf_counter() - start]))
+    results.append(("load_warm", _timed(lambda: load_outlet_files(files, snapshot_dir=snapshot_dir), repeat)))
+
+    def clean():
+        frames = [validate_sales_data(frame)[0] for _, frame in loaded.data.groupby("Outlet", sort=False)]
+        return compact_sales_data(pd.concat(frames, ignore_index=True))
+
+    df = clean()
+    results.append(("validate", _timed(clean, repeat)))
+
+    # Sidebar filter chain, a handful of typical selections
+    categories = df["Category"].value_counts().index
+    outlets = df["Outlet"].cat.categories
+    selections = [
+        {},
+        {"category": categories[0]},
+        {"outlet": outlets[0]},
+        {"margin": "10 - 20"},
+        {"exclude": list(categories[:3]), "outlet": outlets[-1], "margin": "20 - 30"},
+    ]
+    engine = FilterEngine(df)
+    results.append(("filter_index", _timed(lambda: FilterEngine(df), repeat)))
+    results.append(("filter", _timed(_each(lambda sel: engine.apply(**sel), selections), repeat)))
+
+    # Item search: substring and code lookups, then ranked fuzzy search
+    search = ItemSearch(df)
+    names = df["Items"].cat.categories
+    terms = [names[0].split()[0].lower(), names[-1].split()[1].lower(), "ko", names[len(names) // 2][:6]]
+    codes = [code[:4] for code in df["Item Code"].cat.categories[:3]]
+    results.append(("search_index", _timed(lambda: ItemSearch(df), repeat)))
+    results.append(("search", _timed(lambda: (
+        [search.columns["Items"].mask(term) for term in terms],
+        [search.columns["Item Code"].mask(code) for code in codes],
+    ), repeat)))
+    fuzzy_terms = [name.lower().replace(" ", "", 1)[:14] for name in names[:: max(1, len(names) // 4)]]
+    results.append(("fuzzy_index", _timed(lambda: ItemSearch(df).fuzzy, 1)))
+    results.append(("fuzzy_search", _timed(_each(lambda term: search.ranked(term, 20), fuzzy_terms), repeat)))
+
+    # Outlet summary and top products, straight from rows and via the cube
+    cube = SalesCube(df)
+    results.append(("groupby", _timed(_each(
+        lambda sel: (summarize(engine.apply(**sel)), top_products(engine.apply(**sel))), selections
+    ), repeat)))
+    results.append(("cube_build", _timed(lambda: SalesCube(df), 1)))
+    results.append(("cube", _timed(_each(
+        lambda sel: (cube.summarize(by="Outlet", **sel), cube.top_products(30, **sel)), selections
+    ), repeat)))
+
+    # Every outlet against the network average, ranked top movers
+    variance = VarianceEngine(df)
+    results.append(("variance_build", _timed(lambda: VarianceEngine(df), repeat)))
+    results.append(("variance", _timed(_each(
+        lambda outlet: top_movers(variance.compare(NETWORK, outlet)), variance.slices
+    ), repeat)))
+
+    # The same filters, searches and summaries on the optional DuckDB backend
+    if query.available():
+        duck = query.DuckQuery(df)
+        results.append(("duckdb_build", _timed(lambda: query.DuckQuery(df), 1)))
+        results.append(("duckdb_filter", _timed(_each(lambda sel: duck.apply(**sel), selections), repeat)))
+        results.append(("duckdb_search", _timed(lambda: (
+            [duck.positions(search=term) for term in terms],
+            [duck.positions(code=code) for code in codes],
+        ), repeat)))
+        results.append(("duckdb_aggregate", _timed(_each(
+            lambda sel: (duck.summarize(by="Outlet", **sel), duck.top_products(30, **sel)), selections
+        ), repeat)))
+
+    # The HTTP API on one keep-alive connection: cached summaries, then
+    # row exports as JSON and as an Arrow stream
+    server = api.serve_in_thread({"bench": lambda: LoadResult(df, {}, [], {})})
+    conn = http.client.HTTPConnection(*server.server_address)
+
+    def fetch(path):
+        conn.request("GET", path)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{path}: HTTP {response.status} {body[:200]!r}")
+        return body
+
+    results.append(("api_summary", _timed(_each(
+        lambda sel: fetch("/summary?" + urlencode(sel, doseq=True)), selections
+    ), repeat)))
+    results.append(("api_rows_json", _timed(lambda: fetch("/rows?limit=10000"), repeat)))
+    results.append(("api_rows_arrow", _timed(lambda: fetch("/rows?format=arrow"), repeat)))
+    conn.close()
+    server.shutdown()
+    server.server_close()
+    return results, df
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(outlet_counts, rows=ROWS_PER_OUTLET, repeat=5, workdir=".bench", seed=0):
+    """The benchmark document: environment metadata and one record per stage and size."""
+    books = os.path.join(workdir, f"rows{rows}-seed{seed}")
+    records = []
+    for outlets in outlet_counts:
+        start = time.perf_counter()
+        files = write_outlet_workbooks(books, outlets, rows, seed)
+        print(f"{outlets} outlets: workbooks ready in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        results, df = bench_dataset(files, os.path.join(workdir, "snapshots"), repeat)
+        for stage, times in results:
+            records.append({
+                "outlets": outlets,
+                "rows": len(df),
+                "memory_bytes": int(df.memory_usage(deep=True).sum()),
+                "stage": stage,
+                "runs": len(times),
+                "min_s": round(min(times), 6),
+                "median_s": round(statistics.median(times), 6),
+            })
+            print(f"  {stage:<13} {min(times) * 1000:10.1f} ms", file=sys.stderr)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "rows_per_outlet": rows,
+        "seed": seed,
+        "results": records,
+    }
+
+
+def compare(current, baseline):
+    """Per stage and size: baseline and current median seconds and their ratio."""
+    old = {(r["outlets"], r["stage"]): r["median_s"] for r in baseline["results"]}
+    table = pd.DataFrame([
+        {"outlets": r["outlets"], "stage": r["stage"], "baseline_s": old.get((r["outlets"], r["stage"])),
+         "current_s": r["median_s"]}
+        for r in current["results"]
+    ])
+    table["ratio"] = (table["current_s"] / table["baseline_s"]).round(2)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--outlets", type=int, nargs="+", default=[16, 50, 200], help="outlet counts to time")
+    parser.add_argument("--rows", type=int, default=ROWS_PER_OUTLET, help="rows per outlet workbook")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per timed stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=".bench", help="where workbooks and snapshots are kept")
+    parser.add_argument("--out", default="bench-results.json", help="JSON results file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = run(sorted(args.outlets), args.rows, args.repeat, args.workdir, args.seed)
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+    print(args.out)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        print(compare(results, baseline).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import hashlib
+
+import pandas as pd
+import plotly.express as px
+
+# ===============================
+# CACHED FIGURES
+# ===============================
+# Building a Plotly Express figure costs tens of milliseconds, far more
+# than serialising it. Figures are cached (in a ResultCache from
+# store.get_figure_cache) under the chart name, a hash of the table the
+# chart is drawn from and the arguments that shape it, so a rerun whose
+# chart inputs did not change reuses the figure and identical tables
+# reached through different filters share one. Cached figures are shared
+# between sessions and must not be mutated.
+
+
+def content_hash(frame):
+    """A stable hash of ``frame``'s columns and values."""
+    # Categoricals would hash every category; hash just the values shown
+    frame = frame.astype({c: object for c in frame.columns if isinstance(frame[c].dtype, pd.CategoricalDtype)})
+    digest = hashlib.sha1(repr(list(frame.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cached_figure(cache, name, frame, build, *args):
+    """``build(frame, *args)``, reused while ``frame``'s content and ``args`` are unchanged."""
+    return cache.get_or_compute((name, content_hash(frame)) + args, lambda: build(frame, *args))
+
+
+def _outlet_sales(summary, search_term):
+    fig = px.bar(
+        summary,
+        x="Outlet",
+        y="Total Sales",
+        color="Margin %",
+        text="Total Sales",
+        title=f"Outlet-wise Sales & GP for '{search_term}'"
+    )
+    fig.update_traces(texttemplate="%{text:.2s}", textposition="outside")
+    fig.update_layout(xaxis_title="", yaxis_title="Sales (AED)", height=500)
+    return fig
+
+
+def _top_products(top, outlet):
+    fig = px.bar(
+        top,
+        x="Total Sales",
+        y="Items",
+        orientation="h",
+        text="Total Sales",
+        hover_data={"Total Sales": ":,.2f", "GP%": True},
+        title=f"Top Selling Products ({outlet})" if outlet != "All" else "Top Selling Products (All Outlets)"
+    )
+    fig.update_traces(texttemplate="%{text:.2s}", textposition="outside", marker_color="teal")
+    fig.update_layout(yaxis={"categoryorder": "total ascending"}, xaxis_title="Sales", height=700)
+    return fig
+
+
+def outlet_sales_figure(cache, summary, search_term):
+    """Bar chart of a searched item's sales per outlet, coloured by margin."""
+    return cached_figure(cache, "outlet_sales", summary, _outlet_sales, search_term)
+
+
+def top_products_figure(cache, top, outlet="All"):
+    """Horizontal bar chart of the top-selling products."""
+    return cached_figure(cache, "top_products", top, _top_products, outlet)
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+import pandas as pd
+from pandas.api.types import is_float_dtype
+
+from sales_data.config import DIMENSION_COLUMNS, INGEST_COLUMNS, MEASURE_COLUMNS, SALES_COLUMNS
+
+REQUIRED_COLUMNS = INGEST_COLUMNS
+
+
+def _item_codes_as_text(codes):
+    # Some workbooks store codes as numbers, others as text; blanks turn
+    # numeric codes into floats, which would otherwise print as "123.0".
+    if is_float_dtype(codes):
+        codes = codes.astype("Int64")
+    return codes.astype(str).where(codes.notna())
+
+
+class SchemaError(ValueError):
+    """A workbook lacks columns the dashboards need."""
+
+
+def require_columns(columns, source="data", required=REQUIRED_COLUMNS):
+    """Raise SchemaError naming the ``required`` columns missing from ``columns``."""
+    missing = [col for col in required if col not in columns]
+    if missing:
+        found = ", ".join(str(col) for col in columns if col is not None) or "no columns"
+        raise SchemaError(f"{source}: missing required column(s) {', '.join(missing)} (found {found})")
+
+
+# Per-file outcome of validate_sales_data(): rows read and rows rejected
+# for having no Category
+ValidationReport = namedtuple("ValidationReport", ["source", "rows", "rejected"])
+
+
+def validate_sales_data(df, source="data"):
+    """Check, coerce and clean one file's frame in a single vectorised pass.
+
+    Returns (cleaned frame, ValidationReport). Raises SchemaError when a
+    required column is missing, before any other work is done.
+    """
+    require_columns(list(df.columns), source)
+
+    rows = len(df)
+    # Remove items without category
+    df = df[df["Category"].notna()].reset_index(drop=True)
+
+    # Ensure numeric
+    for col in MEASURE_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("float64")
+
+    df["Item Code"] = _item_codes_as_text(df["Item Code"])
+
+    # Compute margin %
+    df["Margin %"] = (df["Total Profit"] / df["Total Sales"] * 100).fillna(0).round(2)
+    return df, ValidationReport(source, rows, rows - len(df))
+
+
+def compact_sales_data(df):
+    """Shrink a combined, cleaned frame to the dashboard schema.
+
+    Dimensions become categoricals and ``Margin %`` (already rounded to two
+    decimals) becomes float32. Sales and profit stay float64 so totals over
+    every outlet stay exact to two decimals.
+    """
+    if df.empty:
+        return df
+    df = df[[col for col in SALES_COLUMNS if col in df.columns]]
+    return df.astype(
+        {col: "category" for col in DIMENSION_COLUMNS if col in df.columns}
+        | {"Margin %": "float32"}
+    )
@@ -0,0 +1,81 @@
+import os
+
+# ===============================
+# DATA REGISTRY
+# ===============================
+DATA_DIR = os.environ.get(
+    "SALES_DATA_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def data_path(file):
+    return os.path.join(DATA_DIR, file)
+
+
+OUTLET_FILES = {
+    "Hilal": data_path("Hilal.Xlsx"),
+    "Safa Super": data_path("safa super.Xlsx"),
+    "Azhar HP": data_path("Azhar HP.Xlsx"),
+    "Azhar GT": data_path("Azhar GT.Xlsx"),
+    "Blue Pearl": data_path("Blue Pearl.Xlsx"),
+    "Fida": data_path("Fida HP.Xlsx"),
+    "Hadeqat": data_path("Hadeqat.Xlsx"),
+    "Jais": data_path("jais.Xlsx"),
+    "Sabah": data_path("sabah.Xlsx"),
+    "Sahat": data_path("sahat.Xlsx"),
+    "Shams salem": data_path("Salem.Xlsx"),
+    "Shams Liwan": data_path("liwan.Xlsx"),
+    "Superstore": data_path("superstore.Xlsx"),
+    "Tay Tay": data_path("Tay Tay.Xlsx"),
+    "Safa oudmehta": data_path("oudmehta.Xlsx"),
+    "Port saeed": data_path("port saeed.Xlsx"),
+}
+
+# Monthly logistics workbooks, oldest first
+LOGISTICS_OUTLET = "Logistics"
+LOGISTICS_MONTH_FILES = {
+    "Sep": data_path("log sep.Xlsx"),
+    "Oct": data_path("log oct.Xlsx"),
+}
+MONTHS = list(LOGISTICS_MONTH_FILES)
+
+# ===============================
+# ACCESS
+# ===============================
+# Logging in with this password, when set, also opens the admin panels
+ADMIN_PASSWORD = os.environ.get("SALES_ADMIN_PASSWORD")
+
+# ===============================
+# QUERY BACKEND
+# ===============================
+# "pandas" (in-process indexes and cube) or "duckdb" (sales_data.query);
+# duckdb falls back to pandas when the package is not installed
+QUERY_BACKEND = os.environ.get("SALES_QUERY_BACKEND", "pandas").lower()
+
+# ===============================
+# SHARED DATASETS
+# ===============================
+# Directory (ideally on tmpfs, e.g. /dev/shm/sales) where cleaned datasets
+# are published as Arrow files memory-mapped by every server process on
+# the host (sales_data.shared); unset keeps one private copy per process
+SHARED_DIR = os.environ.get("SALES_SHARED_DIR")
+
+# ===============================
+# SCHEMA
+# ===============================
+DIMENSION_COLUMNS = ["Outlet", "Category", "Item Code", "Items"]
+MEASURE_COLUMNS = ["Total Sales", "Total Profit"]
+SALES_COLUMNS = DIMENSION_COLUMNS + MEASURE_COLUMNS + ["Margin %"]
+
+# Workbook columns read at ingest; everything else in the sheets is skipped
+INGEST_COLUMNS = ["Category", "Items", "Item Code"] + MEASURE_COLUMNS
+
+# Non-overlapping margin ranges offered by the sidebar, lower bound inclusive
+MARGIN_BUCKETS = {
+    "< 0": (float("-inf"), 0),
+    "0 - 5": (0, 5),
+    "5 - 10": (5, 10),
+    "10 - 20": (10, 20),
+    "20 - 30": (20, 30),
+    "30 +": (30, float("inf")),
+}
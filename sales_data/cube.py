@@ -0,0 +1,89 @@
+from sales_data.aggregates import key_insights, summarize, top_products
+from sales_data.config import MEASURE_COLUMNS
+from sales_data.filters import FilterEngine, margin_bucket_codes
+
+# ===============================
+# PRE-AGGREGATED SALES CUBE
+# ===============================
+# Sales and profit are summed once per load at a few grains. Every
+# rollup keeps Category and the margin bucket so that the sidebar filters
+# can be applied to it; summary panels then re-aggregate a small rollup
+# instead of the row-level frame. Rollups are listed smallest first.
+ROLLUPS = {
+    "category": ["Category", "Margin Bucket"],
+    "outlet_category": ["Outlet", "Category", "Margin Bucket"],
+    "category_item": ["Category", "Margin Bucket", "Items"],
+    "outlet_item": ["Outlet", "Category", "Margin Bucket", "Items"],
+    "outlet_item_code": ["Outlet", "Category", "Margin Bucket", "Item Code"],
+}
+
+# Top-product lists kept ready for every single outlet and every single
+# category (and for everything), the selections the top-products chart
+# is drawn for. Built on first use from the item rollups.
+PAYLOAD_TOP = 30
+
+
+class SalesCube:
+    def __init__(self, df):
+        base = df.assign(**{"Margin Bucket": margin_bucket_codes(df["Margin %"])})
+        self.rollups = {}
+        self.engines = {}
+        for name, dims in ROLLUPS.items():
+            if not set(dims) <= set(base.columns):
+                continue
+            rollup = base.groupby(dims, observed=True)[MEASURE_COLUMNS].sum().reset_index()
+            self.rollups[name] = rollup
+            self.engines[name] = FilterEngine(rollup)
+        self._payloads = None
+
+    def rollup(self, columns, category="All", exclude=(), outlet="All", margin="All"):
+        """Smallest rollup holding ``columns``, with the sidebar filters applied."""
+        needed = set(columns) | ({"Outlet"} if outlet != "All" else set())
+        for name, dims in ROLLUPS.items():
+            if name in self.rollups and needed <= set(dims):
+                return self.engines[name].apply(category, exclude, outlet, margin)
+        raise KeyError(f"No rollup covers {sorted(needed)}")
+
+    def insights(self, **selection):
+        return key_insights(self.rollup([], **selection))
+
+    def summarize(self, by="Outlet", margin_column="Avg Margin %", **selection):
+        columns = [by] if isinstance(by, str) else list(by)
+        return summarize(self.rollup(columns, **selection), by=by, margin_column=margin_column)
+
+    def top_products(self, n=30, **selection):
+        key = _payload_key(**selection)
+        if n <= PAYLOAD_TOP and key is not None:
+            payload = self.top_payloads().get(key)
+            if payload is not None:
+                return payload.head(n).copy()
+        return top_products(self.rollup(["Items"], **selection), n)
+
+    def top_payloads(self):
+        """{(category, outlet): top PAYLOAD_TOP items}, with one of the two "All"."""
+        if self._payloads is None:
+            payloads = {}
+            if "category_item" in self.rollups:
+                payloads["All", "All"] = top_products(self.rollups["category_item"], PAYLOAD_TOP)
+            for column, rollup in (("Category", "category_item"), ("Outlet", "outlet_item")):
+                if rollup not in self.rollups:
+                    continue
+                items = (
+                    self.rollups[rollup]
+                    .groupby([column, "Items"], observed=True)[MEASURE_COLUMNS].sum()
+                    .reset_index()
+                    .sort_values("Total Sales", ascending=False, kind="stable")
+                )
+                items = items.groupby(column, observed=True).head(PAYLOAD_TOP)
+                items["GP%"] = (items["Total Profit"] / items["Total Sales"] * 100).round(2)
+                for label, top in items.groupby(column, observed=True):
+                    key = (label, "All") if column == "Category" else ("All", label)
+                    payloads[key] = top.drop(columns=column).reset_index(drop=True)
+            self._payloads = payloads
+        return self._payloads
+
+
+def _payload_key(category="All", exclude=(), outlet="All", margin="All"):
+    if exclude or margin != "All" or (category != "All" and outlet != "All"):
+        return None
+    return category, outlet
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from sales_data.config import MARGIN_BUCKETS
+
+# ===============================
+# SIDEBAR FILTER ENGINE
+# ===============================
+# Built once per dataset load: row positions per category, per outlet and
+# per margin bucket. A filter combination intersects those sorted position
+# arrays and takes the matching rows in one go.
+MARGIN_EDGES = np.array([low for low, _ in MARGIN_BUCKETS.values()][1:], dtype="float32")
+
+
+def margin_bucket_codes(margins):
+    """Position of each margin in MARGIN_BUCKETS (0 = "< 0", ..., 5 = "30 +")."""
+    return np.searchsorted(MARGIN_EDGES, np.asarray(margins, dtype="float32"), side="right").astype("int8")
+
+
+def _positions(df, column):
+    if column not in df.columns:
+        return {}
+    return {key: np.sort(pos) for key, pos in df.groupby(column, observed=True).indices.items()}
+
+
+def _codes(df, column):
+    if column not in df.columns:
+        return np.full(len(df), -1, dtype=np.int32), pd.Index([])
+    values = df[column].astype("category") if df[column].dtype != "category" else df[column]
+    return values.cat.codes.to_numpy(), values.cat.categories
+
+
+class FilterEngine:
+    def __init__(self, df):
+        self.df = df
+        self.by_category = _positions(df, "Category")
+        self.by_outlet = _positions(df, "Outlet")
+        if "Margin Bucket" in df.columns:
+            self.margin_bucket = df["Margin Bucket"].to_numpy()
+        elif "Margin %" in df.columns:
+            self.margin_bucket = margin_bucket_codes(df["Margin %"])
+        else:
+            self.margin_bucket = np.zeros(len(df), "int8")
+        self.category_codes, self.categories = _codes(df, "Category")
+        self.outlet_codes, self.outlets = _codes(df, "Outlet")
+        self.by_margin = {
+            label: np.flatnonzero(self.margin_bucket == code)
+            for code, label in enumerate(MARGIN_BUCKETS)
+        }
+        self._empty = np.array([], dtype=np.intp)
+
+    def positions(self, category="All", exclude=(), outlet="All", margin="All"):
+        """Sorted row positions matching the sidebar selection ("All" = no filter)."""
+        selected = [
+            lookup.get(value, self._empty)
+            for value, lookup in (
+                (category, self.by_category),
+                (outlet, self.by_outlet),
+                (margin, self.by_margin),
+            )
+            if value != "All"
+        ]
+        # Intersect smallest first so each step shrinks the work
+        selected.sort(key=len)
+        rows = selected[0] if selected else np.arange(len(self.df))
+        for other in selected[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        for excluded in exclude:
+            if excluded in self.by_category:
+                rows = np.setdiff1d(rows, self.by_category[excluded], assume_unique=True)
+        return rows
+
+    def restrict(self, rows, category="All", exclude=(), outlet="All", margin="All"):
+        """The subset of ``rows`` (row positions) matching the sidebar selection.
+
+        Costs O(len(rows)), so it suits small candidate sets such as the
+        rows of a few looked-up items.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        keep = np.ones(len(rows), dtype=bool)
+        if category != "All":
+            keep &= self.category_codes[rows] == self._code(self.categories, category)
+        if exclude:
+            excluded = [self._code(self.categories, value) for value in exclude]
+            keep &= ~np.isin(self.category_codes[rows], excluded)
+        if outlet != "All":
+            keep &= self.outlet_codes[rows] == self._code(self.outlets, outlet)
+        if margin != "All":
+            keep &= self.margin_bucket[rows] == list(MARGIN_BUCKETS).index(margin)
+        return rows[keep]
+
+    @staticmethod
+    def _code(labels, value):
+        # -2 never occurs, so an unknown label matches no row
+        return labels.get_loc(value) if value in labels else -2
+
+    def apply(self, category="All", exclude=(), outlet="All", margin="All"):
+        rows = self.positions(category, exclude, outlet, margin)
+        if len(rows) == len(self.df):
+            return self.df
+        return self.df.take(rows)
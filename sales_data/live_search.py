@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from sales_data.profiling import current_profile, profiling_for, stage
+
+# ===============================
+# SEARCH-AS-YOU-TYPE
+# ===============================
+# In live mode the search boxes commit after a typing pause (Streamlit's
+# debounced text_input) and the search, with the aggregates that depend
+# on it, runs on a small shared thread pool instead of the script thread.
+# Each session keeps only its latest query: submitting a new one cancels
+# the previous job, before it starts or at its next checkpoint. The page
+# shows a preview of the first matches while a slow job runs and reruns
+# once it is done, when the finished job is picked up again by its key.
+# A job is profiled as background work of the run that submitted it.
+DEBOUNCE = "300ms"
+PREVIEW_ROWS = 20
+WAIT_SECONDS = 0.05
+POLL_SECONDS = 0.25
+SEARCH_WORKERS = 2
+MAX_SESSIONS = 64
+
+_pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="live-search")
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search job superseded by a newer query."""
+
+
+class SearchJob:
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+        self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+def _run(compute, job, profile):
+    with profiling_for(profile), stage("search"):
+        return compute(job)
+
+
+def checkpoint(job):
+    """Stop ``job`` here if a newer query replaced it (no-op outside a job)."""
+    if job is not None and job.cancelled:
+        raise SearchCancelled(job.key)
+
+
+class SearchRunner:
+    """Latest search job per session for one loaded frame."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._latest = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, session, key, compute):
+        """The job computing ``compute(job)`` for ``key``, reusing the session's current one if it matches."""
+        with self._lock:
+            previous = self._latest.get(session)
+            if previous is not None and previous.key == key:
+                self._latest.move_to_end(session)
+                return previous
+            if previous is not None:
+                previous.cancel()
+            job = SearchJob(key)
+            profile = current_profile()
+            if profile is not None:
+                profile.hold()
+            job.future = _pool.submit(_run, compute, job, profile)
+            if profile is not None:
+                job.future.add_done_callback(lambda _: profile.release())
+            self._latest[session] = job
+            self._latest.move_to_end(session)
+            while len(self._latest) > self.max_sessions:
+                self._latest.popitem(last=False)[1].cancel()
+        return job
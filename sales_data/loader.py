@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from sales_data.cleaning import SchemaError
+from sales_data.snapshot import read_snapshot, snapshot_is_stale
+
+# ===============================
+# MULTI-OUTLET LOADER
+# ===============================
+# openpyxl parsing is pure Python and CPU-bound, so stale workbooks are
+# parsed in a process pool. Fresh snapshots are cheap to read and are
+# loaded in-process to avoid the cost of shipping frames between processes.
+# Workers never fork the server itself: forking a process whose other
+# threads may hold locks can deadlock the child.
+LoadResult = namedtuple(
+    "LoadResult", ["data", "timings", "missing", "refreshed", "reports", "errors"], defaults=(None, None)
+)
+
+
+def default_workers():
+    configured = os.environ.get("SALES_LOADER_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _read_timed(path, snapshot_dir=None):
+    # (frame, seconds, error); a workbook whose header lacks a required
+    # column gives no frame and the SchemaError message instead
+    start = time.perf_counter()
+    df, error = None, None
+    try:
+        df = read_snapshot(path, snapshot_dir)
+    except SchemaError as exc:
+        error = str(exc)
+    return df, time.perf_counter() - start, error
+
+
+def load_outlet_frames(outlet_files, max_workers=None, snapshot_dir=None):
+    """Read every existing workbook in ``outlet_files`` ({outlet: path}).
+
+    Returns ({outlet: frame}, {outlet: seconds}, [missing paths],
+    {outlet: schema error}); each frame is tagged with its ``Outlet``
+    column, and workbooks with a schema error have no frame.
+    """
+    max_workers = max_workers or default_workers()
+    present = {o: f for o, f in outlet_files.items() if os.path.exists(f)}
+    missing = [f for f in outlet_files.values() if not os.path.exists(f)]
+
+    stale = [o for o, f in present.items() if snapshot_is_stale(f, snapshot_dir)]
+    frames, timings, errors = {}, {}, {}
+
+    if len(stale) > 1 and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(stale)), mp_context=_pool_context()) as pool:
+            futures = {o: pool.submit(_read_timed, present[o], snapshot_dir) for o in stale}
+            for outlet, future in futures.items():
+                frames[outlet], timings[outlet], errors[outlet] = future.result()
+
+    for outlet, file in present.items():
+        if outlet not in timings:
+            frames[outlet], timings[outlet], errors[outlet] = _read_timed(file, snapshot_dir)
+
+    ordered = {}
+    for outlet in present:
+        df = frames[outlet]
+        if df is not None:
+            df["Outlet"] = outlet
+            ordered[outlet] = df
+    return ordered, timings, missing, {o: error for o, error in errors.items() if error}
+
+
+def load_outlet_files(outlet_files, max_workers=None, snapshot_dir=None):
+    """Load every workbook in ``outlet_files`` ({outlet: path}) into one frame.
+
+    Returns a LoadResult with the concatenated data (tagged with an
+    ``Outlet`` column, in registry order), per-outlet load seconds, the
+    paths that were not found, the per-outlet refresh time, no validation
+    reports and the schema error of each workbook that was skipped.
+    """
+    frames, timings, missing, errors = load_outlet_frames(outlet_files, max_workers, snapshot_dir)
+    now = datetime.now()
+    data = pd.concat(list(frames.values()), ignore_index=True) if frames else pd.DataFrame()
+    return LoadResult(data, timings, missing, {outlet: now for outlet in frames}, {}, errors)
@@ -0,0 +1,47 @@
+import numpy as np
+
+# ===============================
+# PRESORTED ROW ORDERS
+# ===============================
+# Each sortable column is argsorted once per load, together with the rank
+# of every row in that order. A filtered view is put in order either by
+# walking the permutation and keeping its own rows (large views) or by
+# sorting its rows' integer ranks (small views), so no float comparison
+# sort runs per interaction. Top-N product lists need no row order:
+# aggregates.top_products picks them with nlargest (partial selection).
+SORTABLE_COLUMNS = ["Margin %", "Total Sales", "Total Profit"]
+
+
+class SortIndex:
+    def __init__(self, df, columns=SORTABLE_COLUMNS):
+        self.size = len(df)
+        self.order = {}
+        self.rank = {}
+        for column in columns:
+            if column not in df.columns:
+                continue
+            values = df[column].to_numpy()
+            order = np.argsort(values, kind="stable")
+            rank = np.empty(self.size, dtype=np.int64)
+            rank[order] = np.arange(self.size)
+            self.order[column], self.rank[column] = order, rank
+
+    def sorted_rows(self, rows, column, ascending=True):
+        """``rows`` (row positions) ordered by ``column``."""
+        rows = np.asarray(rows, dtype=np.intp)
+        if len(rows) * 16 < self.size:
+            ordered = rows[np.argsort(self.rank[column][rows])]
+        else:
+            member = np.zeros(self.size, dtype=bool)
+            member[rows] = True
+            order = self.order[column]
+            ordered = order[member[order]]
+        return ordered if ascending else ordered[::-1]
+
+
+def page_bounds(total, page, page_size):
+    """(start, stop, pages) of the 1-based ``page``, clamped to the data."""
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), pages
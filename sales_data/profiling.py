@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# ===============================
+# PER-RERUN PROFILING
+# ===============================
+# Opt-in with SALES_PROFILE=1. A page starts a RerunProfile at the top of
+# each run and wraps its stages (load, clean, filter, search, aggregate,
+# render) in stage(); the data layer reports the clean stage and cache
+# hits and misses through the same thread-local profile, so nothing is
+# passed around. Stages record self time: a nested stage is not counted
+# again in the stage around it. Finished runs are appended to a JSON-lines
+# log. With profiling off every hook is a no-op.
+#
+# A background search job started by a run is profiled as part of that
+# run: its stages go under background_s (their time overlaps the run's
+# own), its counters with the run's, and the run's log line is written
+# once the last such job has ended.
+PROFILE_ENABLED = os.environ.get("SALES_PROFILE", "").lower() not in ("", "0", "false", "no")
+PROFILE_LOG = os.environ.get("SALES_PROFILE_LOG", "profile.jsonl")
+STAGES = ["load", "clean", "filter", "search", "aggregate", "render"]
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class RerunProfile:
+    def __init__(self, page, log_path=PROFILE_LOG):
+        self.page = page
+        self.log_path = log_path
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.background = {}
+        self.counters = {}
+        self.total = None
+        self._started = time.perf_counter()
+        self._thread = threading.get_ident()
+        self._stacks = {}
+        self._jobs = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        stack = self._stacks.setdefault(threading.get_ident(), [])
+        stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            stages = self.stages if threading.get_ident() == self._thread else self.background
+            with self._lock:
+                stages[name] = stages.get(name, 0.0) + elapsed - nested
+            if stack:
+                stack[-1] += elapsed
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def hold(self):
+        """Keep the log line back until release(), for a background job of this run."""
+        with self._lock:
+            self._jobs += 1
+
+    def release(self):
+        with self._lock:
+            self._jobs -= 1
+            ready = self.total is not None and not self._jobs
+        if ready:
+            self._write()
+
+    def finish(self):
+        """Stop the clock, append the run to the log and return it as a dict."""
+        with self._lock:
+            finishing = self.total is None
+            if finishing:
+                self.total = time.perf_counter() - self._started
+            ready = finishing and not self._jobs
+        if finishing and getattr(_local, "profile", None) is self:
+            _local.profile = None
+        if ready:
+            self._write()
+        return self.record()
+
+    def _write(self):
+        if self.log_path:
+            line = json.dumps(self.record())
+            with _log_lock, open(self.log_path, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+
+    def record(self):
+        total = self.total if self.total is not None else time.perf_counter() - self._started
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "page": self.page,
+            "total_s": round(total, 6),
+            "stages_s": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "other_s": round(total - sum(self.stages.values()), 6),
+            "background_s": {name: round(seconds, 6) for name, seconds in self.background.items()},
+            "counters": dict(self.counters),
+        }
+
+
+def start_profile(page, enabled=None):
+    """Begin profiling this thread's run of ``page``; None when profiling is off."""
+    if not (PROFILE_ENABLED if enabled is None else enabled):
+        _local.profile = None
+        return None
+    _local.profile = RerunProfile(page)
+    return _local.profile
+
+
+def current_profile():
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def profiling_for(profile):
+    """Profile a block on a worker thread as background work of ``profile`` (None: not profiled)."""
+    previous = current_profile()
+    _local.profile = profile
+    try:
+        yield
+    finally:
+        _local.profile = previous
+
+
+def stage(name):
+    """Time a block as stage ``name`` of the current run, if one is being profiled."""
+    profile = current_profile()
+    return profile.stage(name) if profile is not None else nullcontext()
+
+
+def count(name, n=1):
+    profile = current_profile()
+    if profile is not None:
+        profile.count(name, n)
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+from sales_data.config import MARGIN_BUCKETS
+from sales_data.search_index import REGEX_CHARS, ColumnIndex, ItemSearch
+
+try:
+    import duckdb
+except ImportError:  # optional backend
+    duckdb = None
+
+# ===============================
+# DUCKDB QUERY BACKEND
+# ===============================
+# Optional (SALES_QUERY_BACKEND=duckdb). The loaded frame is copied once
+# into an in-memory DuckDB table with a row_id column holding its row
+# positions; sidebar filters, margin buckets, item searches and summaries
+# then run as SQL on DuckDB's multi-threaded vectorised engine. DuckQuery
+# answers the FilterEngine and SalesCube calls the pages make, and
+# DuckSearch the ItemSearch ones, so the pages do not change. Every call
+# runs on its own cursor, which makes a shared instance safe to use from
+# concurrent sessions.
+TABLE = "sales"
+BUCKET_LABELS = list(MARGIN_BUCKETS)
+MEASURES = (
+    'sum("Total Sales") AS "Total Sales", sum("Total Profit") AS "Total Profit", '
+    'round(sum("Total Profit") / nullif(sum("Total Sales"), 0) * 100, 2)'
+)
+
+
+def available():
+    return duckdb is not None
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _bucket_case():
+    # Bucket position as in filters.margin_bucket_codes (lower bound inclusive)
+    edges = [low for low, _ in MARGIN_BUCKETS.values()][1:]
+    whens = " ".join(f'WHEN "Margin %" < {edge} THEN {code}' for code, edge in enumerate(edges))
+    return f"CASE {whens} ELSE {len(edges)} END"
+
+
+def _match(column, term):
+    # Same semantics as ColumnIndex: case-insensitive substring, or a
+    # regex when the term contains regex syntax
+    if REGEX_CHARS & set(term):
+        return f"regexp_matches({_quote(column)}, ?, 'i')", [term]
+    return f"contains(lower({_quote(column)}), ?)", [term.lower()]
+
+
+class DuckQuery:
+    def __init__(self, df):
+        self.df = df
+        self.columns = list(df.columns)
+        self.con = duckdb.connect()
+        frame = df.assign(row_id=np.arange(len(df), dtype=np.int64))
+        # Dimensions become VARCHAR so that any label compares cleanly
+        casts = ", ".join(
+            f"CAST({_quote(col)} AS VARCHAR) AS {_quote(col)}"
+            for col in df.columns
+            if isinstance(df[col].dtype, pd.CategoricalDtype)
+        )
+        self.con.register("frame", frame)
+        self.con.execute(
+            f"CREATE TABLE {TABLE} AS SELECT * {f'REPLACE ({casts})' if casts else ''} FROM frame"
+        )
+        self.con.unregister("frame")
+
+    def _where(self, category="All", exclude=(), outlet="All", margin="All", search=None, code=None):
+        clauses, params = [], []
+        if category != "All":
+            clauses.append('"Category" = ?')
+            params.append(category)
+        if exclude:
+            clauses.append(f'"Category" NOT IN ({", ".join("?" * len(exclude))})')
+            params.extend(exclude)
+        if outlet != "All":
+            clauses.append('"Outlet" = ?')
+            params.append(outlet)
+        if margin != "All":
+            clauses.append(f"{_bucket_case()} = ?")
+            params.append(BUCKET_LABELS.index(margin))
+        for column, term in (("Items", search), ("Item Code", code)):
+            if term:
+                clause, values = _match(column, term)
+                clauses.append(clause)
+                params.extend(values)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def execute(self, sql, params=()):
+        """Run ``sql`` on a fresh cursor; the table is ``sales``."""
+        return self.con.cursor().execute(sql, list(params))
+
+    # ----------- FilterEngine interface -----------
+    def positions(self, category="All", exclude=(), outlet="All", margin="All", search=None, code=None):
+        """Sorted row positions matching the sidebar selection and searches."""
+        where, params = self._where(category, exclude, outlet, margin, search, code)
+        rows = self.execute(f"SELECT row_id FROM {TABLE}{where} ORDER BY row_id", params).fetchnumpy()["row_id"]
+        return np.asarray(rows, dtype=np.intp)
+
+    def restrict(self, rows, category="All", exclude=(), outlet="All", margin="All"):
+        """The subset of ``rows`` (row positions) matching the sidebar selection."""
+        rows = np.asarray(rows, dtype=np.intp)
+        where, params = self._where(category, exclude, outlet, margin)
+        if not where:
+            return rows
+        cursor = self.con.cursor()
+        cursor.register("picked", pd.DataFrame({"row_id": rows.astype(np.int64)}))
+        keep = cursor.execute(
+            f"SELECT row_id FROM {TABLE}{where} AND row_id IN (SELECT row_id FROM picked)", params
+        ).fetchnumpy()["row_id"]
+        return rows[np.isin(rows, keep)]
+
+    def first_matching(self, rows, n, search=None, code=None):
+        """The first ``n`` of ``rows`` (sorted row positions) matching the item searches."""
+        rows = np.asarray(rows, dtype=np.intp)
+        where, params = self._where(search=search, code=code)
+        cursor = self.con.cursor()
+        if len(rows) < len(self.df):
+            cursor.register("picked", pd.DataFrame({"row_id": rows.astype(np.int64)}))
+            where += (" AND " if where else " WHERE ") + "row_id IN (SELECT row_id FROM picked)"
+        found = cursor.execute(
+            f"SELECT row_id FROM {TABLE}{where} ORDER BY row_id LIMIT {int(n)}", params
+        ).fetchnumpy()["row_id"]
+        return np.asarray(found, dtype=np.intp)
+
+    def apply(self, category="All", exclude=(), outlet="All", margin="All"):
+        rows = self.positions(category, exclude, outlet, margin)
+        if len(rows) == len(self.df):
+            return self.df
+        return self.df.take(rows)
+
+    # ----------- SalesCube interface -----------
+    def insights(self, **selection):
+        """(total sales, total profit, margin %) of the selection."""
+        where, params = self._where(**selection)
+        sales, profit = self.execute(
+            f'SELECT coalesce(sum("Total Sales"), 0), coalesce(sum("Total Profit"), 0) FROM {TABLE}{where}',
+            params,
+        ).fetchone()
+        return sales, profit, (profit / sales * 100) if sales > 0 else 0
+
+    def summarize(self, by="Outlet", margin_column="Avg Margin %", **selection):
+        """Sales and profit summed per ``by``, largest sales first."""
+        keys = ", ".join(_quote(col) for col in ([by] if isinstance(by, str) else by))
+        where, params = self._where(**selection)
+        return self.execute(
+            f'SELECT {keys}, {MEASURES} AS {_quote(margin_column)} '
+            f'FROM {TABLE}{where} GROUP BY {keys} ORDER BY "Total Sales" DESC',
+            params,
+        ).df()
+
+    def top_products(self, n=30, **selection):
+        """The ``n`` best-selling items of the selection with their GP%."""
+        where, params = self._where(**selection)
+        return self.execute(
+            f'SELECT "Items", {MEASURES} AS "GP%" '
+            f'FROM {TABLE}{where} GROUP BY "Items" ORDER BY "Total Sales" DESC LIMIT {int(n)}',
+            params,
+        ).df()
+
+    def margin_buckets(self, by=None, **selection):
+        """Item count, sales and profit per margin range (every range, even empty)."""
+        keys = [by] if isinstance(by, str) else list(by or [])
+        quoted = [_quote(col) for col in keys]
+        where, params = self._where(**selection)
+        buckets = ", ".join(f"({code}, ?)" for code in range(len(BUCKET_LABELS)))
+        key_select = "".join(f"k.{col}, " for col in quoted)
+        key_join = "".join(f" AND s.{col} = k.{col}" for col in quoted)
+        keys_from = f"(SELECT DISTINCT {', '.join(quoted)} FROM {TABLE}{where}) k CROSS JOIN " if keys else ""
+        table = self.execute(
+            f"WITH s AS (SELECT *, {_bucket_case()} AS bucket FROM {TABLE}{where}) "
+            f'SELECT {key_select}b.label AS "Margin Range", count(s.bucket) AS "Item Count", '
+            f'coalesce(sum(s."Total Sales"), 0) AS "Total Sales", '
+            f'coalesce(sum(s."Total Profit"), 0) AS "Total Profit" '
+            f"FROM {keys_from}(VALUES {buckets}) b(code, label) "
+            f"LEFT JOIN s ON s.bucket = b.code{key_join} "
+            f"GROUP BY {key_select}b.code, b.label ORDER BY {key_select}b.code",
+            params * (2 if keys else 1) + BUCKET_LABELS,
+        ).df()
+        table["Margin Range"] = pd.Categorical(table["Margin Range"], categories=BUCKET_LABELS)
+        return table
+
+
+class DuckSearch(ItemSearch):
+    """ItemSearch whose row masks come from DuckDB instead of trigram indexes."""
+
+    def __init__(self, df, query):
+        self.df = df
+        self.query = query
+        self._columns = None
+        self._masks = {}
+        self._fuzzy = None
+
+    @property
+    def columns(self):
+        # Distinct-value indexes, only for value_ids() (SKU code lookups)
+        if self._columns is None:
+            self._columns = {
+                column: ColumnIndex(self.df[column]) for column in ("Items", "Item Code") if column in self.df.columns
+            }
+        return self._columns
+
+    def mask(self, column, term):
+        key = (column, term)
+        if key not in self._masks:
+            if len(self._masks) > 256:
+                self._masks.clear()
+            search = {"search": term} if column == "Items" else {"code": term}
+            mask = np.zeros(len(self.df), dtype=bool)
+            mask[self.query.positions(**search)] = True
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def preview(self, frame, terms, n=20):
+        """The first ``n`` rows of ``frame`` matching every (column, term) in ``terms``."""
+        searches = {"search" if column == "Items" else "code": term for column, term in terms}
+        return self.df.take(self.query.first_matching(frame.index.to_numpy(), n, **searches))
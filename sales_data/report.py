@@ -0,0 +1,106 @@
+"""Write the dashboards' standard reports without a UI server.
+
+    python -m sales_data.report --out reports
+    python -m sales_data.report --dataset Oct --format parquet
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+from sales_data.aggregates import margin_buckets, summarize
+from sales_data.config import MONTHS
+from sales_data.store import get_cube, get_logistics_data, get_outlet_data, get_sku_master
+
+# ===============================
+# BATCH REPORTS
+# ===============================
+TOP_PRODUCTS = 30
+
+
+def build_reports(df):
+    """Every standard report of a loaded frame, as {name: DataFrame}."""
+    cube = get_cube(df)
+    sku = get_sku_master(df)
+
+    reports = {
+        "outlet_summary": cube.summarize(by="Outlet"),
+        "category_margins": cube.summarize(by="Category"),
+        "outlet_category": cube.summarize(by=["Outlet", "Category"]),
+        "margin_buckets": margin_buckets(df),
+        "outlet_margin_buckets": margin_buckets(df, by="Outlet"),
+        "top_products": cube.top_products(TOP_PRODUCTS),
+    }
+    reports["top_products_by_outlet"] = _per_group(
+        df["Outlet"].cat.categories, "Outlet", lambda outlet: cube.top_products(TOP_PRODUCTS, outlet=outlet)
+    )
+    reports["top_products_by_category"] = _per_group(
+        df["Category"].cat.categories, "Category", lambda category: cube.top_products(TOP_PRODUCTS, category=category)
+    )
+
+    # Per-item cross-outlet table: one row per item code and outlet
+    items = summarize(sku.pairs, by=["Item Code", "Outlet"], margin_column="Margin %")
+    names = sku.table[["Items", "Category", "Outlets"]]
+    reports["item_across_outlets"] = (
+        items.join(names, on="Item Code")
+        [["Item Code", "Items", "Category", "Outlet", "Outlets", "Total Sales", "Total Profit", "Margin %"]]
+        .sort_values(["Item Code", "Total Sales"], ascending=[True, False])
+    )
+    return reports
+
+
+def _per_group(labels, column, build):
+    frames = [build(label).assign(**{column: label}) for label in labels]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    table = pd.concat(frames, ignore_index=True)
+    return table[[column] + [c for c in table.columns if c != column]]
+
+
+def write_reports(reports, out_dir, fmt="csv"):
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name, table in reports.items():
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        if fmt == "parquet":
+            table.to_parquet(path, index=False)
+        else:
+            table.to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default="outlets", choices=["outlets"] + MONTHS,
+                        help="'outlets' for all outlet workbooks or a logistics month")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"])
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    data = get_outlet_data() if args.dataset == "outlets" else get_logistics_data(args.dataset)
+    for file in data.missing:
+        print(f"File not found: {file}", file=sys.stderr)
+    if data.data.empty:
+        print("No data loaded.", file=sys.stderr)
+        return 1
+    loaded = time.perf_counter()
+
+    written = write_reports(build_reports(data.data), args.out, args.format)
+    done = time.perf_counter()
+    for path in written:
+        print(path)
+    print(
+        f"{len(data.data):,} rows from {len(data.timings)} files: "
+        f"load {loaded - start:.2f}s, reports {done - loaded:.2f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
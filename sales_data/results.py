@@ -0,0 +1,78 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from sales_data.profiling import count
+
+# ===============================
+# AGGREGATE RESULT CACHE
+# ===============================
+# One cache per loaded frame, shared by every session in the process.
+# Entries are keyed on the view name plus the normalised filter state and
+# evicted least-recently-used first once either bound is exceeded.
+# Cached values are shared between sessions and must not be mutated.
+MAX_ENTRIES = 512
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def filter_key(category="All", exclude=(), outlet="All", margin="All", search=None, code=None):
+    """Hashable, order-insensitive form of the sidebar and search state."""
+    return (
+        category,
+        tuple(sorted(exclude)),
+        outlet,
+        margin,
+        search or None,
+        code or None,
+    )
+
+
+def _sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                count("result_hit")
+                return self._entries[key][0]
+            self.misses += 1
+            count("result_miss")
+        value = compute()
+        size = _sizeof(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
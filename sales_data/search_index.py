@@ -0,0 +1,260 @@
+import re
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# ITEM SEARCH INDEX
+# ===============================
+# Searches run over the distinct values of a categorical column rather
+# than over every row. Each distinct value is lowercased once and its
+# trigrams are posted to an inverted index; a search intersects the
+# posting lists of the term's trigrams, confirms the candidates with a
+# plain substring check and maps the matching values back to rows.
+#
+# Terms shorter than three characters, or containing regex syntax (the
+# dashboards have always passed search terms to str.contains as regexes),
+# are matched against the distinct values with str.contains instead.
+REGEX_CHARS = set(".^$*+?{}[]\\|()")
+NGRAM = 3
+PREVIEW_CHUNK = 4096
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class ColumnIndex:
+    def __init__(self, values):
+        values = values.astype("category") if values.dtype != "category" else values
+        self.values = pd.Index(values.cat.categories.astype(str))
+        self.lowered = [value.lower() for value in self.values]
+        # Row code -1 (missing) maps onto the trailing False slot
+        self.codes = values.cat.codes.to_numpy()
+        postings = {}
+        for code, text in enumerate(self.lowered):
+            for gram in _ngrams(text):
+                postings.setdefault(gram, []).append(code)
+        self.postings = {gram: np.array(codes, dtype=np.int32) for gram, codes in postings.items()}
+
+    def matching_values(self, term):
+        """Codes of the distinct values containing ``term`` (case-insensitive)."""
+        if len(term) < NGRAM or REGEX_CHARS & set(term):
+            hits = self.values.str.contains(term, case=False, regex=True)
+            return np.flatnonzero(np.asarray(hits, dtype=bool))
+        lowered = term.lower()
+        lists = [self.postings.get(gram) for gram in _ngrams(lowered)]
+        if any(codes is None for codes in lists):
+            return np.array([], dtype=np.int32)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for codes in lists[1:]:
+            candidates = np.intersect1d(candidates, codes, assume_unique=True)
+        return np.array([c for c in candidates if lowered in self.lowered[c]], dtype=np.int32)
+
+    def mask(self, term):
+        """Boolean mask over all rows whose value contains ``term``."""
+        hit = np.zeros(len(self.values) + 1, dtype=bool)
+        hit[self.matching_values(term)] = True
+        return hit[self.codes]
+
+
+# ===============================
+# RANKED (FUZZY) NAME SEARCH
+# ===============================
+# Outlets spell the same SKU differently ("COCA-COLA 330ML", "Coca Cola
+# 330 ml"), so names are normalised (lowercase, punctuation dropped,
+# digits split from units) and each distinct normalised name gets one id.
+# Candidates are the names sharing the most trigrams with the query,
+# counted in one vectorised bincount over the posting lists; only the
+# best few hundred are re-scored in Python.
+CANDIDATES = 200
+MIN_SCORE = 40
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_DIGIT_ALPHA = re.compile(r"(?<=\d)(?=[a-z])|(?<=[a-z])(?=\d)")
+
+
+def normalize_name(text):
+    text = _NON_ALNUM.sub(" ", str(text).lower())
+    return " ".join(_DIGIT_ALPHA.sub(" ", text).split())
+
+
+def _name_grams(name):
+    # Spaces are dropped so "cocacola" and "coca cola" share trigrams
+    compact = name.replace(" ", "")
+    return _ngrams(compact) if len(compact) >= NGRAM else {compact}
+
+
+def _token_coverage(query_tokens, name_tokens):
+    """Share of query tokens with a close match among the name's tokens."""
+    if not query_tokens:
+        return 0.0
+    covered = 0.0
+    for token in query_tokens:
+        best = 0.0
+        for other in name_tokens:
+            if token == other:
+                best = 1.0
+                break
+            best = max(best, SequenceMatcher(None, token, other).ratio())
+        covered += best if best >= 0.75 else 0.0
+    return covered / len(query_tokens)
+
+
+class FuzzyIndex:
+    def __init__(self, df):
+        items = df["Items"].astype("category") if df["Items"].dtype != "category" else df["Items"]
+        normalized = [normalize_name(value) for value in items.cat.categories]
+        names, raw_to_name = np.unique(np.array(normalized, dtype=object), return_inverse=True)
+        self.names = names
+        self.tokens = [name.split() for name in names]
+        codes = items.cat.codes.to_numpy()
+        valid = codes >= 0
+        self.row_name = np.full(len(codes), -1, dtype=np.int64)
+        self.row_name[valid] = raw_to_name[codes[valid]]
+
+        postings = {}
+        self.gram_counts = np.zeros(len(names), dtype=np.int32)
+        for name_id, name in enumerate(names):
+            grams = _name_grams(name)
+            self.gram_counts[name_id] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(name_id)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+        # Per-name rollups across all outlets, for the ranked result table
+        rows = self.row_name[valid]
+        size = len(names)
+        self.sales = np.bincount(rows, weights=df["Total Sales"].to_numpy()[valid], minlength=size)
+        self.profit = np.bincount(rows, weights=df["Total Profit"].to_numpy()[valid], minlength=size)
+        pairs = pd.DataFrame({"name": rows, "outlet": df["Outlet"].to_numpy()[valid]}).drop_duplicates()
+        self.outlets = np.bincount(pairs["name"].to_numpy(), minlength=size)
+        spelled = pd.DataFrame({"name": rows, "raw": items.to_numpy()[valid]})
+        counts = spelled.value_counts(sort=True)
+        self.spellings = np.bincount(counts.index.get_level_values("name").to_numpy(), minlength=size)
+        # Most frequent raw spelling of each name
+        display = counts.reset_index().drop_duplicates("name")
+        self.display = np.empty(size, dtype=object)
+        self.display[display["name"].to_numpy()] = display["raw"].to_numpy()
+
+    def search(self, term, k=20):
+        """Up to ``k`` (name id, score 0-100) pairs, best first."""
+        query = normalize_name(term)
+        if not query:
+            return []
+        grams = [g for g in _name_grams(query) if g in self.postings]
+        if not grams:
+            return []
+        shared = np.bincount(
+            np.concatenate([self.postings[g] for g in grams]), minlength=len(self.names)
+        )
+        total = len(_name_grams(query))
+        coverage = shared / total
+        dice = 2 * shared / (total + self.gram_counts)
+        rank = coverage + 0.1 * dice
+        count = min(CANDIDATES, int((shared > 0).sum()))
+        candidates = np.argpartition(-rank, count - 1)[:count]
+
+        query_tokens = query.split()
+        scored = []
+        for name_id in candidates:
+            name = self.names[name_id]
+            score = (
+                0.5 * _token_coverage(query_tokens, self.tokens[name_id])
+                + 0.3 * coverage[name_id]
+                + 0.2 * SequenceMatcher(None, query, name).ratio()
+            )
+            scored.append((int(name_id), round(100 * score, 1)))
+        scored = [pair for pair in scored if pair[1] >= MIN_SCORE]
+        scored.sort(key=lambda pair: (-pair[1], len(self.names[pair[0]])))
+        return scored[:k]
+
+    def rows(self, name_ids):
+        """Boolean mask over all rows whose normalised name is in ``name_ids``."""
+        hit = np.zeros(len(self.names) + 1, dtype=bool)
+        hit[list(name_ids)] = True
+        return hit[self.row_name]
+
+
+class ItemSearch:
+    def __init__(self, df):
+        self.df = df
+        self.columns = {
+            column: ColumnIndex(df[column]) for column in ("Items", "Item Code") if column in df.columns
+        }
+        self._masks = {}
+        self._fuzzy = None
+
+    @property
+    def fuzzy(self):
+        # Built on first ranked search only
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self.df)
+        return self._fuzzy
+
+    def ranked(self, term, k=20):
+        """Top ``k`` item names matching ``term`` across all outlets, with scores."""
+        fuzzy = self.fuzzy
+        matches = fuzzy.search(term, k)
+        ids = [name_id for name_id, _ in matches]
+        return pd.DataFrame({
+            "Items": fuzzy.display[ids],
+            "Score": [score for _, score in matches],
+            "Spellings": fuzzy.spellings[ids],
+            "Outlets": fuzzy.outlets[ids],
+            "Total Sales": fuzzy.sales[ids].round(2),
+            "Total Profit": fuzzy.profit[ids].round(2),
+            "name_id": ids,
+        })
+
+    def filter_ranked(self, frame, ranked):
+        """Rows of ``frame`` whose item name matches a row of ``ranked()``."""
+        return frame[self.fuzzy.rows(ranked["name_id"])[frame.index.to_numpy()]]
+
+    def mask(self, column, term):
+        key = (column, term)
+        if key not in self._masks:
+            if len(self._masks) > 256:
+                self._masks.clear()
+            self._masks[key] = self.columns[column].mask(term)
+        return self._masks[key]
+
+    def value_ids(self, column, term):
+        """Category codes of the distinct ``column`` values containing ``term``."""
+        return self.columns[column].matching_values(term)
+
+    def rows(self, column, term):
+        return np.flatnonzero(self.mask(column, term))
+
+    def preview(self, frame, terms, n=20):
+        """The first ``n`` rows of ``frame`` matching every (column, term) in ``terms``.
+
+        Scans ``frame`` in chunks and stops once ``n`` rows are found, so a
+        wide term costs about as much as a narrow one.
+        """
+        hits = []
+        for column, term in terms:
+            index = self.columns[column]
+            hit = np.zeros(len(index.values) + 1, dtype=bool)
+            hit[index.matching_values(term)] = True
+            hits.append((index.codes, hit))
+        positions = frame.index.to_numpy()
+        found = []
+        for start in range(0, len(positions), PREVIEW_CHUNK):
+            chunk = positions[start:start + PREVIEW_CHUNK]
+            keep = np.ones(len(chunk), dtype=bool)
+            for codes, hit in hits:
+                keep &= hit[codes[chunk]]
+            found.extend(chunk[keep][:n - len(found)])
+            if len(found) >= n:
+                break
+        return self.df.take(found)
+
+    def filter(self, frame, column, term):
+        """Rows of ``frame`` whose ``column`` contains ``term``.
+
+        ``frame`` must come from the loaded frame by take() or boolean
+        selection, so that its index labels are row positions in it.
+        """
+        return frame[self.mask(column, term)[frame.index.to_numpy()]]
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from sales_data.cleaning import ValidationReport
+from sales_data.loader import LoadResult
+
+try:
+    import pyarrow as pa
+except ImportError:  # shared mode needs pyarrow
+    pa = None
+
+# ===============================
+# MEMORY-MAPPED SHARED DATASETS
+# ===============================
+# Opt-in with SALES_SHARED_DIR. When several server processes run on one
+# host, the first to need a dataset loads and cleans it as usual and
+# publishes the combined frame as an uncompressed Arrow IPC file; every
+# process (the publisher included) then memory-maps that file. The
+# category codes and measures of the mapped frame point straight into
+# the page cache, so the data is held once per host, however many
+# processes serve it, and loading it is a map rather than a parse.
+#
+# A file is named after its dataset and a token of the source files'
+# paths and content hashes, so an edited workbook leads to a new file (a
+# merely touched one does not) and older versions are removed once it is
+# published (processes still
+# mapping them keep their pages until they move on). The LoadResult
+# details (timings, missing files, refresh times, validation reports and
+# errors) travel in the schema metadata. Mapped columns are read-only.
+SHARED_VERSION = 2
+METADATA_KEY = b"sales_data"
+
+
+def available():
+    return pa is not None
+
+
+def dataset_name(outlet_files):
+    """Stable file-name prefix for the dataset made of ``outlet_files``."""
+    paths = json.dumps([[outlet, os.path.abspath(path)] for outlet, path in outlet_files.items()])
+    return "dataset-" + hashlib.sha1(paths.encode("utf-8")).hexdigest()[:12]
+
+
+def dataset_token(outlet_files, digests):
+    """Version of ``outlet_files`` on disk: each path with its content hash in ``digests`` ({outlet: hash})."""
+    state = [[outlet, os.path.abspath(path), digests.get(outlet)] for outlet, path in outlet_files.items()]
+    return hashlib.sha1(json.dumps([SHARED_VERSION, state]).encode("utf-8")).hexdigest()[:16]
+
+
+def shared_path(directory, name, token):
+    return os.path.join(directory, f"{name}-{token}.arrow")
+
+
+def publish(result, directory, name, token):
+    """Write ``result`` as the shared file for ``token`` and remove older versions."""
+    os.makedirs(directory, exist_ok=True)
+    details = {
+        "timings": result.timings,
+        "missing": result.missing,
+        "refreshed": {outlet: when.isoformat() for outlet, when in result.refreshed.items()},
+        "reports": {outlet: list(report) for outlet, report in (result.reports or {}).items()},
+        "errors": result.errors or {},
+    }
+    table = pa.Table.from_pandas(result.data, preserve_index=False).combine_chunks()
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps(details).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    path = shared_path(directory, name, token)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+    for file in os.listdir(directory):
+        if file.startswith(name + "-") and file.endswith(".arrow") and os.path.join(directory, file) != path:
+            try:
+                os.remove(os.path.join(directory, file))
+            except OSError:
+                pass
+    return path
+
+
+def open_shared(directory, name, token):
+    """The LoadResult mapped from the shared file for ``token``, or None if there is none."""
+    path = shared_path(directory, name, token)
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        details = json.loads(table.schema.metadata[METADATA_KEY])
+    except (FileNotFoundError, KeyError, ValueError, pa.ArrowInvalid):
+        return None
+    # split_blocks keeps every column a view of the mapped buffers
+    data = table.to_pandas(split_blocks=True)
+    return LoadResult(
+        data,
+        details["timings"],
+        details["missing"],
+        {outlet: datetime.fromisoformat(when) for outlet, when in details["refreshed"].items()},
+        {outlet: ValidationReport(*report) for outlet, report in details["reports"].items()},
+        details["errors"],
+    )
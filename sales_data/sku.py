@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from sales_data.aggregates import summarize
+from sales_data.config import MEASURE_COLUMNS
+
+# ===============================
+# CROSS-OUTLET SKU MASTER
+# ===============================
+# One entry per Item Code, built once per load. Row positions are stored
+# grouped by code (then outlet) with per-code offsets, and sales/profit
+# are pre-summed per (code, outlet, category), so looking an item up
+# across outlets touches only that item's handful of entries.
+# Codes are the integer codes of the loaded frame's "Item Code" categorical.
+
+
+def _offsets(sorted_codes, size):
+    return np.searchsorted(sorted_codes, np.arange(size + 1))
+
+
+def _ranges(offsets, code_ids):
+    # Concatenated offsets[c]:offsets[c + 1] ranges, without a Python loop
+    code_ids = np.asarray(code_ids, dtype=np.intp)
+    starts, stops = offsets[code_ids], offsets[code_ids + 1]
+    lengths = stops - starts
+    shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return shift + np.arange(lengths.sum())
+
+
+def _most_common(codes, labels):
+    pairs = pd.DataFrame({"code": codes, "label": labels}).value_counts(sort=True)
+    return pairs.reset_index().drop_duplicates("code").set_index("code")["label"]
+
+
+class SkuMaster:
+    def __init__(self, df):
+        item_codes = df["Item Code"].cat.codes.to_numpy()
+        outlet_codes = df["Outlet"].cat.codes.to_numpy()
+        self.codes = df["Item Code"].cat.categories
+        size = len(self.codes)
+
+        valid = np.flatnonzero(item_codes >= 0)
+        order = np.lexsort((outlet_codes[valid], item_codes[valid]))
+        self.row_order = valid[order]
+        self.row_offsets = _offsets(item_codes[self.row_order], size)
+
+        self.pairs = (
+            df.groupby(["Item Code", "Outlet", "Category"], observed=True)[MEASURE_COLUMNS]
+            .sum()
+            .reset_index()
+        )
+        self.pair_offsets = _offsets(self.pairs["Item Code"].cat.codes.to_numpy(), size)
+
+        codes = item_codes[valid]
+        totals = self.pairs.groupby("Item Code", observed=False)[MEASURE_COLUMNS].sum()
+        self.table = pd.DataFrame({
+            "Items": _most_common(codes, df["Items"].to_numpy()[valid]).reindex(range(size)).to_numpy(),
+            "Category": _most_common(codes, df["Category"].to_numpy()[valid]).reindex(range(size)).to_numpy(),
+            "Outlets": np.diff(
+                _offsets(self.pairs.drop_duplicates(["Item Code", "Outlet"])["Item Code"].cat.codes.to_numpy(), size)
+            ),
+            "Total Sales": totals["Total Sales"].to_numpy(),
+            "Total Profit": totals["Total Profit"].to_numpy(),
+        }, index=pd.Index(self.codes, name="Item Code"))
+
+    def rows(self, code_ids):
+        """Sorted row positions of every row carrying one of ``code_ids``."""
+        return np.sort(self.row_order[_ranges(self.row_offsets, code_ids)])
+
+    def lookup(self, code_ids):
+        """Canonical name, category, outlet count and totals per item code."""
+        return self.table.iloc[list(code_ids)].reset_index()
+
+    def outlet_totals(self, code_ids, category="All", exclude=(), outlet="All", margin_column="Margin %"):
+        """Per-outlet totals of the given item codes, largest sales first."""
+        pairs = self.pairs.take(_ranges(self.pair_offsets, code_ids))
+        if category != "All":
+            pairs = pairs[pairs["Category"] == category]
+        if exclude:
+            pairs = pairs[~pairs["Category"].isin(exclude)]
+        if outlet != "All":
+            pairs = pairs[pairs["Outlet"] == outlet]
+        return summarize(pairs, by="Outlet", margin_column=margin_column)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from sales_data.config import MEASURE_COLUMNS
+from sales_data.streaming import iter_batches, read_workbook
+
+# ===============================
+# PARQUET SNAPSHOT CACHE
+# ===============================
+# Each outlet workbook is converted once into a typed Parquet snapshot,
+# streamed batch by batch from the workbook. A small JSON sidecar next to
+# the snapshot records the path, mtime and size of the source file and
+# the snapshot format; the snapshot is rebuilt only when they change.
+SNAPSHOT_DIR = os.environ.get(
+    "SALES_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".snapshots")
+)
+SNAPSHOT_VERSION = 4
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+def content_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path(path, snapshot_dir=None):
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    return os.path.join(snapshot_dir, f"{stem}-{key}.parquet")
+
+
+def _sidecar_path(snapshot):
+    return snapshot + ".json"
+
+
+def snapshot_is_stale(path, snapshot_dir=None):
+    snapshot = snapshot_path(path, snapshot_dir)
+    sidecar = _sidecar_path(snapshot)
+    if not (os.path.exists(snapshot) and os.path.exists(sidecar)):
+        return True
+    try:
+        with open(sidecar, encoding="utf-8") as fh:
+            recorded = json.load(fh)
+    except (OSError, ValueError):
+        return True
+    return recorded != _snapshot_record(path)
+
+
+def _snapshot_record(path):
+    return dict(file_fingerprint(path), version=SNAPSHOT_VERSION)
+
+
+def _write_streamed(path, snapshot, record):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(snapshot) or ".", exist_ok=True)
+    tmp = f"{snapshot}.{os.getpid()}.tmp"
+    writer = None
+    written = False
+    try:
+        for batch in iter_batches(path):
+            if writer is None:
+                # Typed up front: a column blank throughout the first batch
+                # would otherwise be inferred as null and reject later ones
+                schema = pa.schema([
+                    (name, pa.float64() if name in MEASURE_COLUMNS else pa.string()) for name in batch.columns
+                ])
+                writer = pq.ParquetWriter(tmp, schema)
+            writer.write_table(pa.Table.from_pandas(batch, schema=schema, preserve_index=False))
+        writer.close()
+        os.replace(tmp, snapshot)
+        written = True
+    finally:
+        if not written:
+            # A failed parse or write leaves no partial file behind
+            if writer is not None:
+                writer.close()
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    tmp = f"{_sidecar_path(snapshot)}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(record, fh)
+    os.replace(tmp, _sidecar_path(snapshot))
+
+
+def build_snapshot(path, snapshot_dir=None):
+    snapshot = snapshot_path(path, snapshot_dir)
+    try:
+        _write_streamed(path, snapshot, _snapshot_record(path))
+    except (ImportError, OSError):
+        # No Parquet engine or read-only checkout: serve the parsed workbook as is.
+        return read_workbook(path)
+    return pd.read_parquet(snapshot)
+
+
+def read_snapshot(path, snapshot_dir=None):
+    """Read an outlet workbook through its Parquet snapshot, rebuilding it if stale."""
+    if snapshot_is_stale(path, snapshot_dir):
+        return build_snapshot(path, snapshot_dir)
+    try:
+        return pd.read_parquet(snapshot_path(path, snapshot_dir))
+    except (ImportError, OSError, ValueError):
+        return build_snapshot(path, snapshot_dir)
@@ -0,0 +1,381 @@
+import os
+import threading
+import weakref
+from datetime import datetime
+
+import pandas as pd
+
+from sales_data import query, shared
+from sales_data.cleaning import SchemaError, compact_sales_data, validate_sales_data
+from sales_data.config import (
+    DIMENSION_COLUMNS,
+    LOGISTICS_MONTH_FILES,
+    LOGISTICS_OUTLET,
+    MONTHS,
+    OUTLET_FILES,
+    QUERY_BACKEND,
+    SHARED_DIR,
+)
+from sales_data.cube import SalesCube
+from sales_data.filters import FilterEngine
+from sales_data.live_search import SearchRunner
+from sales_data.loader import LoadResult, load_outlet_frames
+from sales_data.paging import SortIndex
+from sales_data.profiling import count, stage
+from sales_data.results import ResultCache
+from sales_data.search_index import ItemSearch
+from sales_data.sku import SkuMaster
+from sales_data.snapshot import content_hash
+from sales_data.variance import VarianceEngine
+
+# ===============================
+# PROCESS-WIDE DATASET CACHE
+# ===============================
+# Streamlit runs every session and page in one server process, so a
+# module-level cache lets all pages share a single cleaned copy of each
+# dataset instead of keeping one per page. Callers must treat the
+# returned frames as read-only.
+#
+# Entries are kept per file, keyed on (mtime, size, content hash). Every
+# call stats the files; only those whose fingerprint changed are
+# re-parsed and spliced back into the combined frame.
+#
+# With SALES_SHARED_DIR set the combined frame is instead mapped from a
+# file shared by every process on the host (sales_data.shared). Once it is
+# mapped the per-file entries keep their fingerprint, refresh time and
+# report but drop their frame; when a file changes, the others are taken
+# back from the mapped frame and only the changed one is re-parsed.
+_files = {}
+_datasets = {}
+_shared = {}
+_lock = threading.Lock()
+
+
+class _FileEntry:
+    # data/report are None and error is set when the file failed validation;
+    # data alone is None while the file is served from a shared mapped frame
+    __slots__ = ("stat", "digest", "data", "seconds", "refreshed", "report", "error")
+
+    def __init__(self, stat, digest, data, seconds, refreshed, report=None, error=None):
+        self.stat = stat
+        self.digest = digest
+        self.data = data
+        self.seconds = seconds
+        self.refreshed = refreshed
+        self.report = report
+        self.error = error
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _fingerprint(outlet, path):
+    # (stat, content hash) of path, hashed only when its stat moved
+    entry = _files.get((outlet, path))
+    stat = _stat_key(path)
+    if entry is not None and entry.stat == stat:
+        return stat, entry.digest
+    digest = content_hash(path)
+    if entry is not None and entry.digest == digest:
+        # Touched but not modified: keep the entry.
+        entry.stat = stat
+    return stat, digest
+
+
+def _changed_files(outlet_files):
+    changed = {}
+    for outlet, path in outlet_files.items():
+        if not os.path.exists(path):
+            continue
+        entry = _files.get((outlet, path))
+        stat, digest = _fingerprint(outlet, path)
+        if entry is not None and entry.digest == digest and (entry.data is not None or entry.error):
+            continue
+        changed[outlet] = (path, stat, digest)
+    return changed
+
+
+def _restore_files(outlet_files, mapped):
+    # Give entries served from the shared frame their rows back from it
+    if "Outlet" not in mapped.columns:
+        return
+    for outlet, path in outlet_files.items():
+        entry = _files.get((outlet, path))
+        if entry is not None and entry.data is None and entry.error is None:
+            rows = mapped[mapped["Outlet"] == outlet].reset_index(drop=True)
+            entry.data = rows.astype({col: object for col in DIMENSION_COLUMNS if col in rows.columns})
+
+
+def get_dataset(outlet_files):
+    """Return the cleaned LoadResult for ``outlet_files``, re-reading only changed files."""
+    if use_shared():
+        return _get_shared_dataset(outlet_files)
+    return _load_dataset(outlet_files)
+
+
+def _load_dataset(outlet_files, mapped=None):
+    dataset_key = tuple(outlet_files.items())
+    with _lock:
+        if mapped is not None:
+            _restore_files(outlet_files, mapped)
+        changed = _changed_files(outlet_files)
+        if changed:
+            count("files_reloaded", len(changed))
+            frames, timings, _, errors = load_outlet_frames({o: p for o, (p, _, _) in changed.items()})
+            now = datetime.now()
+            for outlet, (path, stat, digest) in changed.items():
+                # Validated once per file version; a malformed file keeps
+                # its error until it changes again
+                if outlet in errors:
+                    _files[(outlet, path)] = _FileEntry(stat, digest, None, timings[outlet], now, error=errors[outlet])
+                    continue
+                try:
+                    with stage("clean"):
+                        data, report = validate_sales_data(frames[outlet], source=os.path.basename(path))
+                    entry = _FileEntry(stat, digest, data, timings[outlet], now, report)
+                except SchemaError as exc:
+                    entry = _FileEntry(stat, digest, None, timings[outlet], now, error=str(exc))
+                _files[(outlet, path)] = entry
+
+        tracked = [(o, p) for o, p in outlet_files.items() if (o, p) in _files and os.path.exists(p)]
+        present = [key for key in tracked if _files[key].error is None]
+        missing = [p for p in outlet_files.values() if not os.path.exists(p)]
+        result = _datasets.get(dataset_key)
+        if result is None or changed or list(result.timings) != [o for o, _ in present]:
+            count("loader_miss")
+            entries = [_files[key] for key in present]
+            with stage("clean"):
+                data = (
+                    compact_sales_data(pd.concat([e.data for e in entries], ignore_index=True))
+                    if entries
+                    else pd.DataFrame()
+                )
+            result = LoadResult(
+                data,
+                {o: _files[(o, p)].seconds for o, p in present},
+                missing,
+                {o: _files[(o, p)].refreshed for o, p in present},
+                {o: _files[(o, p)].report for o, p in present},
+                {o: _files[(o, p)].error for o, p in tracked if _files[(o, p)].error},
+            )
+            previous = _datasets.get(dataset_key)
+            if previous is not None:
+                _forget(previous.data)
+            _datasets[dataset_key] = result
+        else:
+            count("loader_hit")
+    return result
+
+
+def _get_shared_dataset(outlet_files):
+    # Mapped from the host-wide file for the current contents of the
+    # workbooks, which is loaded and published first if no process has yet
+    dataset_key = tuple(outlet_files.items())
+    name = shared.dataset_name(outlet_files)
+    with _lock:
+        fingerprints = {o: _fingerprint(o, p) for o, p in outlet_files.items() if os.path.exists(p)}
+        token = shared.dataset_token(outlet_files, {o: digest for o, (_, digest) in fingerprints.items()})
+        entry = _shared.get(dataset_key)
+        if entry is not None and entry[0] == token:
+            count("loader_hit")
+            return entry[1]
+    result = shared.open_shared(SHARED_DIR, name, token)
+    if result is not None:
+        count("shared_hit")
+    else:
+        loaded = _load_dataset(outlet_files, entry[1].data if entry is not None else None)
+        try:
+            shared.publish(loaded, SHARED_DIR, name, token)
+            result = shared.open_shared(SHARED_DIR, name, token)
+        except OSError:
+            result = None
+        if result is None:
+            return loaded
+        # Serve the mapped copy and let the private one go
+        with _lock:
+            if dataset_key in _datasets:
+                _forget(_datasets.pop(dataset_key).data)
+    with _lock:
+        now = datetime.now()
+        for outlet, (stat, digest) in fingerprints.items():
+            _files[(outlet, outlet_files[outlet])] = _FileEntry(
+                stat,
+                digest,
+                None,
+                result.timings.get(outlet, 0.0),
+                result.refreshed.get(outlet, now),
+                result.reports.get(outlet),
+                result.errors.get(outlet),
+            )
+        entry = _shared.get(dataset_key)
+        if entry is not None and entry[0] == token:
+            return entry[1]
+        if entry is not None:
+            _forget(entry[1].data)
+        _shared[dataset_key] = (token, result)
+    return result
+
+
+def get_outlet_data():
+    return get_dataset(OUTLET_FILES)
+
+
+def get_logistics_data(month):
+    return get_dataset({LOGISTICS_OUTLET: LOGISTICS_MONTH_FILES[month]})
+
+
+# Combined monthly frames, keyed on the months and the identity of the
+# per-month frames they were built from
+_monthly = {}
+
+
+def get_monthly_data(months=None):
+    """Logistics data for ``months`` as one frame with an ordered ``Month`` column.
+
+    Months are read (through the per-file cache) only when first requested.
+    """
+    months = [m for m in MONTHS if m in (months or MONTHS)]
+    parts = [get_logistics_data(month).data for month in months]
+    key = tuple(months)
+    with _lock:
+        entry = _monthly.get(key)
+        if entry is not None and all(a is b for a, b in zip(entry[0], parts)):
+            return entry[1]
+    frames = [part.assign(Month=month) for month, part in zip(months, parts) if not part.empty]
+    if frames:
+        combined = pd.concat(frames, ignore_index=True)
+        data = compact_sales_data(combined)
+        data["Month"] = pd.Categorical(combined["Month"], categories=months, ordered=True)
+    else:
+        data = pd.DataFrame()
+    with _lock:
+        previous = _monthly.get(key)
+        if previous is not None and previous[1] is not data:
+            _forget(previous[1])
+        _monthly[key] = (parts, data)
+    return data
+
+
+def clear_cache():
+    with _lock:
+        _files.clear()
+        _datasets.clear()
+        _shared.clear()
+        _monthly.clear()
+    with _derived_lock:
+        _derived.clear()
+        _building.clear()
+
+
+# ===============================
+# DERIVED STRUCTURES
+# ===============================
+# Indexes built from a loaded frame are keyed on the frame's identity.
+# Most of them hold the frame itself, so they would keep it alive: the
+# loader drops them with _forget() when it replaces the frame, and the
+# weak reference only guards against a reused id().
+#
+# Builds run outside the store lock, so lookups of other structures never
+# wait on one; concurrent requests for the same structure wait on its
+# entry in _building and share a single build.
+_derived = {}
+_building = {}
+_derived_lock = threading.Lock()
+
+# Plotly figures are small next to their build cost; keep a few per frame
+FIGURE_ENTRIES = 64
+
+
+def _forget(df):
+    """Drop everything derived from ``df``, which the store no longer serves."""
+    with _derived_lock:
+        for key in [key for key, entry in _derived.items() if entry[0]() is df]:
+            del _derived[key]
+        # Builds still running for it are not kept when they finish
+        for key in [key for key in _building if key[0] == id(df)]:
+            del _building[key]
+
+
+def derived(df, name, build):
+    """Return ``build(df)``, computed once per loaded frame and ``name``."""
+    key = (id(df), name)
+    with _derived_lock:
+        entry = _derived.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+        building = _building.setdefault(key, threading.Lock())
+    with building:
+        with _derived_lock:
+            entry = _derived.get(key)
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+        value = build(df)
+
+        def _drop(ref, key=key):
+            if _derived.get(key, (None,))[0] is ref:
+                _derived.pop(key, None)
+
+        with _derived_lock:
+            if _building.get(key) is building:
+                del _building[key]
+                _derived[key] = (weakref.ref(df, _drop), value)
+    return value
+
+
+def use_shared():
+    return bool(SHARED_DIR) and shared.available()
+
+
+def use_duckdb():
+    return QUERY_BACKEND == "duckdb" and query.available()
+
+
+def get_query(df):
+    """The DuckDB query engine over ``df`` (needs the optional duckdb package)."""
+    return derived(df, "query", query.DuckQuery)
+
+
+def get_filter_engine(df):
+    if use_duckdb():
+        return get_query(df)
+    return derived(df, "filters", FilterEngine)
+
+
+def get_result_cache(df):
+    return derived(df, "results", lambda _: ResultCache())
+
+
+def get_figure_cache(df):
+    return derived(df, "figures", lambda _: ResultCache(max_entries=FIGURE_ENTRIES))
+
+
+def get_cube(df):
+    if use_duckdb():
+        return get_query(df)
+    return derived(df, "cube", SalesCube)
+
+
+def get_item_search(df):
+    if use_duckdb():
+        engine = get_query(df)
+        return derived(df, "duck_search", lambda frame: query.DuckSearch(frame, engine))
+    return derived(df, "search", ItemSearch)
+
+
+def get_search_runner(df):
+    return derived(df, "search_runner", lambda _: SearchRunner())
+
+
+def get_sku_master(df):
+    return derived(df, "sku", SkuMaster)
+
+
+def get_sort_index(df):
+    return derived(df, "sort", SortIndex)
+
+
+def get_variance_engine(df):
+    """Per-outlet item totals of ``df``, for outlet-against-outlet or network variance."""
+    return derived(df, "variance", VarianceEngine)
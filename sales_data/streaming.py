@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from sales_data.cleaning import require_columns
+from sales_data.config import INGEST_COLUMNS, MEASURE_COLUMNS
+
+# ===============================
+# STREAMING WORKBOOK READER
+# ===============================
+# openpyxl's read-only mode parses the sheet XML lazily, so rows are
+# buffered into fixed-size batches, trimmed to the columns the dashboards
+# use and typed on the way. Peak memory follows the batch size, not the
+# workbook size.
+BATCH_ROWS = 5000
+
+
+def _item_code_text(value):
+    # Codes typed as numbers come back as int or integral float; text codes
+    # are kept as the workbook shows them, leading zeros included.
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _to_frame(rows, positions):
+    columns = {}
+    for name, index in positions.items():
+        values = [row[index] if index < len(row) else None for row in rows]
+        if name in MEASURE_COLUMNS:
+            columns[name] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").astype("float64")
+        elif name == "Item Code":
+            columns[name] = pd.Series([None if v is None else _item_code_text(v) for v in values], dtype=object)
+        else:
+            columns[name] = pd.Series([None if v is None else str(v) for v in values], dtype=object)
+    return pd.DataFrame(columns)
+
+
+def iter_batches(path, batch_rows=BATCH_ROWS, columns=INGEST_COLUMNS):
+    """Yield the first sheet of ``path`` as typed DataFrames of up to ``batch_rows`` rows.
+
+    Raises SchemaError, naming the header row as found, when any of
+    ``columns`` is missing from it; only ``columns`` are kept. At least one
+    (possibly empty) frame is always yielded.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        require_columns(header, os.path.basename(path), columns)
+        positions = {name: header.index(name) for name in columns}
+        buffer, yielded = [], False
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row)
+            if len(buffer) >= batch_rows:
+                yield _to_frame(buffer, positions)
+                buffer, yielded = [], True
+        if buffer or not yielded:
+            yield _to_frame(buffer, positions)
+    finally:
+        workbook.close()
+
+
+def read_workbook(path, batch_rows=BATCH_ROWS, columns=INGEST_COLUMNS):
+    """The whole workbook as one typed frame (for callers without Parquet)."""
+    return pd.concat(list(iter_batches(path, batch_rows, columns)), ignore_index=True)
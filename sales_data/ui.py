@@ -0,0 +1,120 @@
+from concurrent.futures import TimeoutError
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from sales_data.live_search import POLL_SECONDS, PREVIEW_ROWS, WAIT_SECONDS
+from sales_data.paging import SORTABLE_COLUMNS, page_bounds
+
+# ===============================
+# PAGED TABLES
+# ===============================
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def paged_dataframe(df, frame, columns, sort_index, sort_by, ascending, key, height=450):
+    """Render one page of ``frame`` (a filtered view of ``df``) in sorted order.
+
+    Sorting uses the presorted ``sort_index`` of ``df`` and only the visible
+    page is taken from ``df`` and sent to the browser.
+    """
+    c1, c2, c3, c4 = st.columns([2, 2, 1, 1])
+    sort_by = c1.selectbox("Sort by", SORTABLE_COLUMNS, index=SORTABLE_COLUMNS.index(sort_by), key=f"{key}_sort")
+    order = c2.radio(
+        "Order", ["Ascending", "Descending"], index=0 if ascending else 1, horizontal=True, key=f"{key}_order"
+    )
+    page_size = c3.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_size")
+
+    total = len(frame)
+    pages = page_bounds(total, 1, page_size)[2]
+    page = c4.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start, stop, _ = page_bounds(total, page, page_size)
+
+    rows = sort_index.sorted_rows(frame.index.to_numpy(), sort_by, ascending=order == "Ascending")
+    visible = df[columns].take(rows[start:stop]).reset_index(drop=True)
+    visible.index += start + 1
+    st.dataframe(visible, use_container_width=True, height=height)
+    st.caption(f"Rows {start + 1:,}–{stop:,} of {total:,} · page {min(page, pages)} of {pages}")
+
+
+# ===============================
+# PROFILING PANEL
+# ===============================
+PROFILE_HISTORY = 20
+
+
+def profile_panel(profile):
+    """Finish ``profile`` (from start_profile) and show it to admins in the sidebar.
+
+    Call last, so that every stage of the run is included, and before any
+    st.stop() that ends the run early.
+    """
+    if profile is None:
+        return
+    record = profile.finish()
+    history = st.session_state.setdefault("profile_history", [])
+    history.append(record)
+    del history[:-PROFILE_HISTORY]
+    if not st.session_state.get("admin"):
+        return
+
+    with st.sidebar.expander("⏱️ Rerun Profile"):
+        st.caption(f"{record['page']}: {record['total_s'] * 1000:,.0f} ms this run")
+        stages = list(record["stages_s"]) + ["other"]
+        runs = [[r["stages_s"].get(s, 0.0) if s != "other" else r["other_s"] for s in stages] for r in history]
+        table = pd.DataFrame(
+            {
+                "This run (ms)": [seconds * 1000 for seconds in runs[-1]],
+                f"Mean of {len(runs)} (ms)": [sum(col) / len(runs) * 1000 for col in zip(*runs)],
+            },
+            index=stages,
+        ).round(1)
+        st.dataframe(table, use_container_width=True)
+        if record["background_s"]:
+            background = sum(record["background_s"].values()) * 1000
+            st.caption(f"Background search: {background:,.0f} ms so far")
+        if record["counters"]:
+            st.caption(" · ".join(f"{name}: {value}" for name, value in sorted(record["counters"].items())))
+        if profile.log_path:
+            st.caption(f"Appended to {profile.log_path}")
+
+
+# ===============================
+# LIVE SEARCH
+# ===============================
+def session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
+
+
+def live_search_result(runner, key, compute, preview, columns):
+    """Result of ``compute`` run as a background search job for this session.
+
+    Returns it if the job finishes within a moment. Otherwise shows
+    ``preview()`` (the first matching rows) and returns None; the caller
+    then stops the script, and a polling fragment reruns the page once
+    the job is done.
+    """
+    job = runner.submit(session_id(), key, compute)
+    try:
+        return job.result(timeout=WAIT_SECONDS)
+    except TimeoutError:
+        pass
+
+    st.caption(f"⏳ Searching… showing the first {PREVIEW_ROWS} matches")
+    st.dataframe(preview()[columns].reset_index(drop=True), use_container_width=True)
+
+    polled = False
+
+    @st.fragment(run_every=POLL_SECONDS)
+    def _poll():
+        # The first, inline call only starts the timer: rerunning from it
+        # would end this run before the page has finished its profile
+        nonlocal polled
+        if polled and job.done():
+            st.rerun()
+        polled = True
+
+    _poll()
+    return None
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+# ===============================
+# VARIANCE ENGINE
+# ===============================
+# Item-level variance between two slices of a loaded frame: two months
+# of the combined monthly frame, two outlets, or an outlet against the
+# network average. Sales and profit are summed per (slice, Item Code)
+# once, with one bincount over the category codes, into a dense
+# slices x items matrix; a comparison is then a handful of vector
+# operations over two of its rows.
+#
+# The workbooks carry no quantities, so the profit change of each item
+# is split on sales and margin rather than on price and units:
+#   volume: the base profit scaled by the growth of total sales
+#   mix:    sales shifting between items of different base margins
+#   margin: the change of the item's own margin on its current sales
+# The three add up to the item's profit change. An item new in the
+# current slice is taken at the base average margin, so its mix effect
+# is its sales at that margin and its margin effect the difference.
+# Rows without an Item Code cannot be aligned and are left out.
+NETWORK = "Network average"
+TOP_MOVERS = 20
+EFFECT_COLUMNS = ["Volume Effect", "Mix Effect", "Margin Effect"]
+
+
+class ItemTotals:
+    """Sales and profit per (slice, item) of one frame, as dense arrays."""
+
+    def __init__(self, df, by="Outlet"):
+        item_codes = df["Item Code"].cat.codes.to_numpy()
+        slice_codes = df[by].cat.codes.to_numpy()
+        self.by = by
+        self.keys = df["Item Code"].cat.categories
+        self.slices = df[by].cat.categories
+        valid = np.flatnonzero((item_codes >= 0) & (slice_codes >= 0))
+        cells = slice_codes[valid].astype(np.int64) * len(self.keys) + item_codes[valid]
+        shape = (len(self.slices), len(self.keys))
+        size = shape[0] * shape[1]
+        self.sales = np.bincount(cells, df["Total Sales"].to_numpy()[valid], size).reshape(shape)
+        self.profit = np.bincount(cells, df["Total Profit"].to_numpy()[valid], size).reshape(shape)
+        self.rows = np.bincount(cells, minlength=size).reshape(shape)
+
+        # Name of each item: that of its first row
+        first = np.full(len(self.keys), len(df), dtype=np.int64)
+        np.minimum.at(first, item_codes[valid], valid)
+        seen = first < len(df)
+        self.names = np.full(len(self.keys), None, dtype=object)
+        self.names[seen] = df["Items"].to_numpy()[first[seen]]
+
+    def totals(self, label):
+        """(sales, profit, carried) per item of slice ``label``, or the per-slice average for NETWORK."""
+        if label == NETWORK:
+            active = self.rows.sum(axis=1) > 0
+            n = max(int(active.sum()), 1)
+            return self.sales.sum(axis=0) / n, self.profit.sum(axis=0) / n, self.rows.sum(axis=0) > 0
+        i = self.slices.get_loc(label)
+        return self.sales[i], self.profit[i], self.rows[i] > 0
+
+
+def variance_table(keys, names, base, current):
+    """Per-item variance of ``current`` against ``base``, with the profit change split into effects.
+
+    ``base`` and ``current`` are (sales, profit, carried) arrays aligned
+    with ``keys``; items carried by neither side are dropped.
+    """
+    s0, p0, c0 = base
+    s1, p1, c1 = current
+    keep = c0 | c1
+    keys, names = keys[keep], names[keep]
+    s0, p0, c0, s1, p1, c1 = s0[keep], p0[keep], c0[keep], s1[keep], p1[keep], c1[keep]
+
+    S0, P0, S1 = s0.sum(), p0.sum(), s1.sum()
+    M0 = P0 / S0 if S0 else 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m0 = np.where(c0 & (s0 != 0), p0 / s0, M0)
+        m1 = np.where(s1 != 0, p1 / s1, m0)
+        w0 = s0 / S0 if S0 else np.zeros_like(s0)
+        growth = S1 / S0 - 1 if S0 else 0.0
+        sales_pct = np.where(s0 != 0, (s1 - s0) / np.abs(s0) * 100, np.nan)
+
+    table = pd.DataFrame({
+        "Item Code": keys,
+        "Items": names,
+        "Sales (Base)": s0,
+        "Sales (Current)": s1,
+        "Δ Sales": s1 - s0,
+        "Δ Sales %": sales_pct,
+        "Profit (Base)": p0,
+        "Profit (Current)": p1,
+        "Δ Profit": p1 - p0,
+        "Margin % (Base)": np.where(c0, m0 * 100, np.nan),
+        "Margin % (Current)": np.where(c1, m1 * 100, np.nan),
+        "Volume Effect": s0 * growth * m0,
+        "Mix Effect": (s1 - S1 * w0) * m0,
+    })
+    # s1 * (m1 - m0), plus the profit of any item without sales
+    table["Margin Effect"] = table["Δ Profit"] - table["Volume Effect"] - table["Mix Effect"]
+    table["Δ Margin pts"] = table["Margin % (Current)"] - table["Margin % (Base)"]
+    return table.round(2)
+
+
+def top_movers(table, n=TOP_MOVERS, by="Δ Profit"):
+    """The ``n`` rows of ``table`` with the largest absolute ``by``, largest first."""
+    values = np.abs(table[by].to_numpy())
+    if n < len(values):
+        pick = np.argpartition(-values, n - 1)[:n]
+    else:
+        pick = np.arange(len(values))
+    pick = pick[np.argsort(-values[pick], kind="stable")]
+    return table.iloc[pick].reset_index(drop=True)
+
+
+def effect_totals(table):
+    """{column: total} of the profit change and each of its effects."""
+    return {column: table[column].sum() for column in ["Δ Profit"] + EFFECT_COLUMNS}
+
+
+class VarianceEngine:
+    """Variance between slices (outlets, months) of one loaded frame."""
+
+    def __init__(self, df, by="Outlet"):
+        self.totals = ItemTotals(df, by)
+
+    @property
+    def slices(self):
+        return list(self.totals.slices)
+
+    def compare(self, base, current):
+        """Per-item variance of slice ``current`` against slice ``base`` (or NETWORK)."""
+        totals = self.totals
+        return variance_table(totals.keys, totals.names, totals.totals(base), totals.totals(current))
+
@@ -1,32 +1,29 @@
 import streamlit as st
-import pandas as pd
-import os
-import plotly.express as px
+
+from sales_data import (
+    filter_key,
+    get_cube,
+    get_figure_cache,
+    get_filter_engine,
+    get_item_search,
+    get_outlet_data,
+    get_result_cache,
+    get_search_runner,
+    get_sku_master,
+    get_sort_index,
+    summarize,
+)
+from sales_data.charts import outlet_sales_figure, top_products_figure
+from sales_data.config import ADMIN_PASSWORD
+from sales_data.live_search import DEBOUNCE, PREVIEW_ROWS, checkpoint
+from sales_data.profiling import stage, start_profile
+from sales_data.ui import live_search_result, paged_dataframe, profile_panel
 
 # ===============================
 # CONFIGURATION
 # ===============================
 st.set_page_config(page_title="Item Sales Across Outlets", layout="wide")
 
-OUTLET_FILES = {
-    "Hilal": "Hilal.Xlsx",
-    "Safa Super": "safa super.Xlsx",
-    "Azhar HP": "Azhar HP.Xlsx",
-    "Azhar GT": "Azhar GT.Xlsx",
-    "Blue Pearl": "Blue Pearl.Xlsx",
-    "Fida": "Fida HP.Xlsx",
-    "Hadeqat": "Hadeqat.Xlsx",
-    "Jais": "jais.Xlsx",
-    "Sabah": "sabah.Xlsx",
-    "Sahat": "sahat.Xlsx",
-    "Shams salem": "Salem.Xlsx",
-    "Shams Liwan": "liwan.Xlsx",
-    "Superstore": "superstore.Xlsx",
-    "Tay Tay": "Tay Tay.Xlsx",
-    "Safa oudmehta": "oudmehta.Xlsx",
-    "Port saeed": "port saeed.Xlsx"
-}
-
 # ===============================
 # PASSWORD PROTECTION
 # ===============================
@@ -40,33 +37,26 @@ if not st.session_state.authenticated:
         if password == "123123":
             st.session_state.authenticated = True
             st.rerun()
+        elif ADMIN_PASSWORD and password == ADMIN_PASSWORD:
+            st.session_state.authenticated = st.session_state.admin = True
+            st.rerun()
         else:
             st.error("❌ Incorrect password. Try again.")
     st.stop()
 
+# Stage timings of this run (SALES_PROFILE=1), shown to admins at the end
+profile = start_profile("search")
+
 # ===============================
 # LOAD ALL OUTLET DATA
 # ===============================
-@st.cache_data
-def load_all_outlet_data():
-    all_data = []
-    for outlet, file in OUTLET_FILES.items():
-        if os.path.exists(file):
-            df = pd.read_excel(file)
-            df["Outlet"] = outlet
-            all_data.append(df)
-        else:
-            st.warning(f"⚠️ File not found: {file}")
-    return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
-
-df = load_all_outlet_data()
-
-# Data cleanup
-df = df[df["Category"].notna()]
-for col in ["Total Sales", "Total Profit"]:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-df["Margin %"] = (df["Total Profit"] / df["Total Sales"] * 100).fillna(0).round(2)
+with stage("load"):
+    data = get_outlet_data()
+for file in data.missing:
+    st.warning(f"⚠️ File not found: {file}")
+for error in data.errors.values():
+    st.error(f"❌ Skipped malformed file: {error}")
+df = data.data
 
 # ===============================
 # SIDEBAR FILTERS
@@ -80,28 +70,87 @@ outlet_list = ["All"] + sorted(df["Outlet"].dropna().unique().tolist())
 selected_outlet = st.sidebar.selectbox("Select Outlet", outlet_list)
 
 st.sidebar.divider()
-search_name = st.sidebar.text_input("🔎 Search by Item Name", placeholder="Type item name...")
-search_code = st.sidebar.text_input("📟 Search by Item Code", placeholder="Type item code...")
+# Search as you type: boxes commit after a pause and search in the background
+live_search = st.sidebar.toggle("⚡ Search as you type")
+live_typing = DEBOUNCE if live_search else False
+search_name = st.sidebar.text_input(
+    "🔎 Search by Item Name", placeholder="Type item name...", live=live_typing, key="search_name"
+)
+search_code = st.sidebar.text_input(
+    "📟 Search by Item Code", placeholder="Type item code...", live=live_typing, key="search_code"
+)
+fuzzy_search = st.sidebar.toggle("🎯 Fuzzy name match (ranked)", help="Also finds other spellings of the item")
+top_k = st.sidebar.slider("Top matches", 5, 50, 20) if fuzzy_search else None
+
+# Data freshness
+with st.sidebar.expander("🕒 Last Refreshed"):
+    for outlet, refreshed in data.refreshed.items():
+        report = data.reports[outlet]
+        st.caption(
+            f"{outlet}: {refreshed:%d %b %Y %H:%M} · {report.rows:,} rows, {report.rejected:,} rejected"
+        )
 
 # ===============================
 # FILTER LOGIC
 # ===============================
 # Main filtered dataset (category + outlet filters, for top products)
-filtered_main = df.copy()
-if selected_category != "All":
-    filtered_main = filtered_main[filtered_main["Category"] == selected_category]
-if selected_outlet != "All":
-    filtered_main = filtered_main[filtered_main["Outlet"] == selected_outlet]
-
-# Filtered dataset including search (for tables & outlet summary)
-filtered_df = filtered_main.copy()
-search_term = None
-if search_name:
-    filtered_df = filtered_df[filtered_df["Items"].str.contains(search_name, case=False, na=False)]
-    search_term = search_name
-elif search_code:
-    filtered_df = filtered_df[filtered_df["Item Code"].astype(str).str.contains(search_code, case=False, na=False)]
-    search_term = search_code
+selection = dict(category=selected_category, outlet=selected_outlet)
+with stage("filter"):
+    engine = get_filter_engine(df)
+    filtered_main = engine.apply(**selection)
+
+# Aggregates are cached per filter state and shared across sessions; the
+# top products and insights do not depend on the search boxes and are
+# answered from the pre-aggregated cube. Charts are cached on the content
+# of the table they are drawn from.
+with stage("aggregate"):
+    results = get_result_cache(df)
+    cube = get_cube(df)
+figures = get_figure_cache(df)
+main_view = filter_key(selected_category, outlet=selected_outlet)
+search_view = filter_key(
+    selected_category,
+    outlet=selected_outlet,
+    search=search_name,
+    code=None if search_name else search_code,
+)
+if search_name and fuzzy_search:
+    search_view += ("ranked", top_k)
+
+# Search results (for tables & outlet summary)
+item_search = get_item_search(df)
+sku = get_sku_master(df)
+search_term = search_name or search_code or None
+
+
+def run_search(job=None):
+    """Rows, ranked matches, matching SKUs and outlet totals of the searched item."""
+    code_ids = None
+    ranked = None
+    if search_name and fuzzy_search:
+        ranked = item_search.ranked(search_name, top_k)
+        rows = item_search.filter_ranked(filtered_main, ranked)
+    elif search_name:
+        rows = item_search.filter(filtered_main, "Items", search_name)
+    else:
+        # Code searches resolve through the SKU master: rows and outlet totals
+        # are looked up per matched code instead of scanning every row
+        code_ids = item_search.value_ids("Item Code", search_code)
+        rows = df.take(engine.restrict(sku.rows(code_ids), **selection))
+    checkpoint(job)
+    matched_codes = code_ids if code_ids is not None else rows["Item Code"].cat.codes.unique()
+    skus = sku.lookup(matched_codes[matched_codes >= 0]).sort_values("Total Sales", ascending=False)
+    checkpoint(job)
+    outlets = results.get_or_compute(
+        ("searched_outlets",) + search_view,
+        lambda: (
+            sku.outlet_totals(code_ids, **selection)
+            if code_ids is not None
+            else summarize(rows, margin_column="Margin %")
+        ),
+    )
+    return rows, ranked, skus, outlets
+
 
 # ===============================
 # PAGE TITLE
@@ -112,9 +161,10 @@ st.title("📦 Item Sales Across Outlets")
 # KEY INSIGHTS
 # ===============================
 if not filtered_main.empty:
-    total_sales = filtered_main["Total Sales"].sum()
-    total_profit = filtered_main["Total Profit"].sum()
-    gp_percent = (total_profit / total_sales * 100) if total_sales > 0 else 0
+    with stage("aggregate"):
+        total_sales, total_profit, gp_percent = results.get_or_compute(
+            ("insights",) + main_view, lambda: cube.insights(**selection)
+        )
 
     st.markdown("### 📈 Key Insights")
     c1, c2, c3 = st.columns(3)
@@ -126,68 +176,77 @@ if not filtered_main.empty:
 # ===============================
 # DISPLAY SEARCH RESULTS
 # ===============================
-if search_term and not filtered_df.empty:
+# A live search still running shows a preview here and fills in when done
+searched = None
+if search_term:
+    with stage("search"):
+        if live_search:
+            searched = live_search_result(
+                get_search_runner(df),
+                ("search",) + search_view,
+                run_search,
+                lambda: item_search.preview(
+                    filtered_main,
+                    [("Items", search_name)] if search_name else [("Item Code", search_code)],
+                    PREVIEW_ROWS,
+                ),
+                ["Items", "Item Code", "Category", "Outlet", "Total Sales", "Total Profit", "Margin %"],
+            )
+        else:
+            searched = run_search()
+
+if searched is not None and not searched[0].empty:
+    filtered_df, ranked_matches, sku_table, outlet_summary = searched
     st.markdown(f"## 🧾 Results for: **{search_term}**")
 
+    # ----------- RANKED MATCHES (fuzzy mode) -----------
+    if ranked_matches is not None:
+        st.markdown("### 🎯 Best Matching Items (All Outlets)")
+        with stage("render"):
+            st.dataframe(ranked_matches.drop(columns="name_id"), use_container_width=True, height=300)
+
     # ----------- FIRST TABLE: Item-wise Details -----------
     st.markdown("### 📋 Item Details per Outlet")
-    item_details = filtered_df[["Items", "Item Code", "Category", "Outlet", "Total Sales", "Total Profit", "Margin %"]] \
-        .sort_values(by="Total Sales", ascending=False) \
-        .reset_index(drop=True)
-    st.dataframe(item_details, use_container_width=True, height=400)
+    with stage("render"):
+        paged_dataframe(
+            df,
+            filtered_df,
+            ["Items", "Item Code", "Category", "Outlet", "Total Sales", "Total Profit", "Margin %"],
+            get_sort_index(df),
+            sort_by="Total Sales",
+            ascending=False,
+            key="item_details",
+            height=400,
+        )
+
+    # ----------- SKU MASTER: Matching Item Codes -----------
+    st.markdown("### 🔗 Matching SKUs (All Outlets)")
+    with stage("render"):
+        st.dataframe(sku_table, use_container_width=True, height=300)
 
     # ----------- SECOND TABLE: Outlet Summary -----------
     st.markdown("### 🏪 Outlet-wise Total (for Searched Item)")
-    outlet_summary = (
-        filtered_df.groupby("Outlet")
-        .agg({"Total Sales": "sum", "Total Profit": "sum"})
-        .reset_index()
-    )
-    outlet_summary["Margin %"] = (outlet_summary["Total Profit"] / outlet_summary["Total Sales"] * 100).round(2)
-    outlet_summary = outlet_summary.sort_values("Total Sales", ascending=False)
-    st.dataframe(outlet_summary[["Outlet", "Total Sales", "Total Profit", "Margin %"]], use_container_width=True, height=350)
+    with stage("render"):
+        st.dataframe(outlet_summary[["Outlet", "Total Sales", "Total Profit", "Margin %"]], use_container_width=True, height=350)
 
     # ----------- OUTLET-WISE BAR CHART -----------
     if selected_outlet == "All":
-        fig_outlet = px.bar(
-            outlet_summary,
-            x="Outlet",
-            y="Total Sales",
-            color="Margin %",
-            text="Total Sales",
-            title=f"Outlet-wise Sales & GP for '{search_term}'"
-        )
-        fig_outlet.update_traces(texttemplate="%{text:.2s}", textposition="outside")
-        fig_outlet.update_layout(xaxis_title="", yaxis_title="Sales (AED)", height=500)
-        st.plotly_chart(fig_outlet, use_container_width=True)
+        with stage("render"):
+            fig_outlet = outlet_sales_figure(figures, outlet_summary, search_term)
+            st.plotly_chart(fig_outlet, use_container_width=True)
 
 # ===============================
 # TOP 30 PRODUCTS BAR CHART
 # ===============================
 st.markdown("### 🏆 Top Selling Products")
-top_products = (
-    filtered_main.groupby("Items")
-    .agg({"Total Sales": "sum", "Total Profit": "sum"})
-    .sort_values("Total Sales", ascending=False)
-    .head(30)
-    .reset_index()
-)
+with stage("aggregate"):
+    top = results.get_or_compute(("top_products",) + main_view, lambda: cube.top_products(30, **selection))
 
-# Compute GP% for hover
-top_products["GP%"] = (top_products["Total Profit"] / top_products["Total Sales"] * 100).round(2)
-
-if not top_products.empty:
-    fig_top = px.bar(
-        top_products,
-        x="Total Sales",
-        y="Items",
-        orientation="h",
-        text="Total Sales",
-        hover_data={"Total Sales": ":,.2f", "GP%": True},
-        title=f"Top Selling Products ({selected_outlet})" if selected_outlet != "All" else "Top Selling Products (All Outlets)"
-    )
-    fig_top.update_traces(texttemplate="%{text:.2s}", textposition="outside", marker_color="teal")
-    fig_top.update_layout(yaxis={"categoryorder": "total ascending"}, xaxis_title="Sales", height=700)
-    st.plotly_chart(fig_top, use_container_width=True)
+if not top.empty:
+    with stage("render"):
+        fig_top = top_products_figure(figures, top, selected_outlet)
+        st.plotly_chart(fig_top, use_container_width=True)
 else:
     st.info("No product data available for the selected filters.")
+
+profile_panel(profile)
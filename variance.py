@@ -1,31 +1,33 @@
 import streamlit as st
-import pandas as pd
-import os
+
+from sales_data import (
+    MARGIN_BUCKETS,
+    VarianceEngine,
+    effect_totals,
+    filter_key,
+    get_cube,
+    get_filter_engine,
+    get_item_search,
+    get_outlet_data,
+    get_result_cache,
+    get_search_runner,
+    get_sort_index,
+    get_variance_engine,
+    key_insights,
+    summarize,
+    top_movers,
+)
+from sales_data.config import ADMIN_PASSWORD
+from sales_data.live_search import DEBOUNCE, PREVIEW_ROWS, checkpoint
+from sales_data.profiling import stage, start_profile
+from sales_data.ui import live_search_result, paged_dataframe, profile_panel
+from sales_data.variance import NETWORK
 
 # ===============================
 # CONFIGURATION
 # ===============================
 st.set_page_config(page_title="Sales & Profit Dashboard", layout="wide")
 
-OUTLET_FILES = {
-    "Hilal": "Hilal.Xlsx",
-    "Safa Super": "safa super.Xlsx",
-    "Azhar HP": "Azhar HP.Xlsx",
-    "Azhar GT": "Azhar GT.Xlsx",
-    "Blue Pearl": "Blue Pearl.Xlsx",
-    "Fida": "Fida HP.Xlsx",
-    "Hadeqat": "Hadeqat.Xlsx",
-    "Jais": "jais.Xlsx",
-    "Sabah": "sabah.Xlsx",
-    "Sahat": "sahat.Xlsx",
-    "Shams salem": "Salem.Xlsx",
-    "Shams Liwan": "liwan.Xlsx",
-    "Superstore": "superstore.Xlsx",
-    "Tay Tay": "Tay Tay.Xlsx",
-    "Safa oudmehta": "oudmehta.Xlsx",
-    "Port saeed": "port saeed.Xlsx"
-}
-
 # ===============================
 # PASSWORD PROTECTION
 # ===============================
@@ -39,37 +41,26 @@ if not st.session_state.authenticated:
         if password == "123123":
             st.session_state.authenticated = True
             st.rerun()
+        elif ADMIN_PASSWORD and password == ADMIN_PASSWORD:
+            st.session_state.authenticated = st.session_state.admin = True
+            st.rerun()
         else:
             st.error("❌ Incorrect password. Try again.")
     st.stop()
 
+# Stage timings of this run (SALES_PROFILE=1), shown to admins at the end
+profile = start_profile("variance")
+
 # ===============================
 # LOAD ALL DATA
 # ===============================
-@st.cache_data
-def load_all_outlet_data():
-    all_data = []
-    for outlet, file in OUTLET_FILES.items():
-        if os.path.exists(file):
-            df = pd.read_excel(file)
-            df["Outlet"] = outlet
-            all_data.append(df)
-        else:
-            st.warning(f"⚠️ File not found: {file}")
-    return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
-
-df = load_all_outlet_data()
-
-# Remove items without category
-df = df[df["Category"].notna()]
-
-# Ensure numeric
-for col in ["Total Sales", "Total Profit"]:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-# Compute margin %
-df["Margin %"] = (df["Total Profit"] / df["Total Sales"] * 100).fillna(0).round(2)
+with stage("load"):
+    data = get_outlet_data()
+for file in data.missing:
+    st.warning(f"⚠️ File not found: {file}")
+for error in data.errors.values():
+    st.error(f"❌ Skipped malformed file: {error}")
+df = data.data
 
 # ===============================
 # SIDEBAR FILTERS
@@ -88,64 +79,94 @@ outlets = ["All"] + sorted(df["Outlet"].unique().tolist())
 selected_outlet = st.sidebar.selectbox("Select Outlet", outlets)
 
 # Margin Filter (non-overlapping)
-margin_filters = ["All", "< 0", "0 - 5", "5 - 10", "10 - 20", "20 - 30", "30 +"]
+margin_filters = ["All"] + list(MARGIN_BUCKETS)
 selected_margin = st.sidebar.selectbox("Select Margin Range (%)", margin_filters)
 
+# Search as you type: boxes commit after a pause and search in the background
+live_search = st.sidebar.toggle("⚡ Search as you type")
+live_typing = DEBOUNCE if live_search else False
+
+# Data freshness
+with st.sidebar.expander("🕒 Last Refreshed"):
+    for outlet, refreshed in data.refreshed.items():
+        report = data.reports[outlet]
+        st.caption(
+            f"{outlet}: {refreshed:%d %b %Y %H:%M} · {report.rows:,} rows, {report.rejected:,} rejected"
+        )
+
 # ===============================
 # APPLY FILTERS
 # ===============================
-filtered_df = df.copy()
-
-# Include Category
-if selected_category != "All":
-    filtered_df = filtered_df[filtered_df["Category"] == selected_category]
-
-# Exclude Categories
-if exclude_categories:
-    filtered_df = filtered_df[~filtered_df["Category"].isin(exclude_categories)]
-
-# Outlet
-if selected_outlet != "All":
-    filtered_df = filtered_df[filtered_df["Outlet"] == selected_outlet]
-
-# Margin (non-overlapping)
-if selected_margin != "All":
-    if selected_margin == "< 0":
-        filtered_df = filtered_df[filtered_df["Margin %"] < 0]
-    elif selected_margin == "0 - 5":
-        filtered_df = filtered_df[(filtered_df["Margin %"] >= 0) & (filtered_df["Margin %"] < 5)]
-    elif selected_margin == "5 - 10":
-        filtered_df = filtered_df[(filtered_df["Margin %"] >= 5) & (filtered_df["Margin %"] < 10)]
-    elif selected_margin == "10 - 20":
-        filtered_df = filtered_df[(filtered_df["Margin %"] >= 10) & (filtered_df["Margin %"] < 20)]
-    elif selected_margin == "20 - 30":
-        filtered_df = filtered_df[(filtered_df["Margin %"] >= 20) & (filtered_df["Margin %"] < 30)]
-    elif selected_margin == "30 +":
-        filtered_df = filtered_df[filtered_df["Margin %"] >= 30]
+selection = dict(
+    category=selected_category,
+    exclude=exclude_categories,
+    outlet=selected_outlet,
+    margin=selected_margin,
+)
+with stage("filter"):
+    filtered_df = get_filter_engine(df).apply(**selection)
 
 # ===============================
 # SEARCH BAR
 # ===============================
 st.title("📊 Sales & Profit Insights (Sep)")
 # Search by Item Name
-search_name = st.text_input("🔎 Search Item Name", placeholder="Type an item name...")
+search_name = st.text_input(
+    "🔎 Search Item Name", placeholder="Type an item name...", live=live_typing, key="search_name"
+)
 
 # Search by Item Code
-search_code = st.text_input("🔎 Search Item Code", placeholder="Type an item code...")
-
-# Apply search filters
-if search_name:
-    filtered_df = filtered_df[filtered_df["Items"].str.contains(search_name, case=False, na=False)]
-if search_code:
-    filtered_df = filtered_df[filtered_df["Item Code"].astype(str).str.contains(search_code, case=False, na=False)]
+search_code = st.text_input(
+    "🔎 Search Item Code", placeholder="Type an item code...", live=live_typing, key="search_code"
+)
+
+# Aggregates below are cached per filter state, shared across sessions
+# and answered from the pre-aggregated cube unless an item search is active
+with stage("aggregate"):
+    results = get_result_cache(df)
+    cube = get_cube(df)
+searching = bool(search_name or search_code)
+view = filter_key(selected_category, exclude_categories, selected_outlet, selected_margin, search_name, search_code)
+item_search = get_item_search(df)
+search_terms = [(column, term) for column, term in (("Items", search_name), ("Item Code", search_code)) if term]
+
+
+def run_search(job=None):
+    """Rows, key insights and outlet summary of the searched view."""
+    rows = filtered_df
+    for column, term in search_terms:
+        rows = item_search.filter(rows, column, term)
+    checkpoint(job)
+    insights = results.get_or_compute(("insights",) + view, lambda: key_insights(rows))
+    checkpoint(job)
+    outlets = results.get_or_compute(("outlets",) + view, lambda: summarize(rows))
+    return rows, insights, outlets
+
+
+with stage("search" if searching else "aggregate"):
+    if not searching:
+        insights = results.get_or_compute(("insights",) + view, lambda: cube.insights(**selection))
+        outlet_summary = results.get_or_compute(("outlets",) + view, lambda: cube.summarize(**selection))
+    elif live_search:
+        searched = live_search_result(
+            get_search_runner(df),
+            ("variance",) + view,
+            run_search,
+            lambda: item_search.preview(filtered_df, search_terms, PREVIEW_ROWS),
+            ["Outlet", "Category", "Item Code", "Items", "Total Sales", "Total Profit", "Margin %"],
+        )
+        if searched is None:
+            profile_panel(profile)
+            st.stop()
+        filtered_df, insights, outlet_summary = searched
+    else:
+        filtered_df, insights, outlet_summary = run_search()
 
 # ===============================
 # KEY INSIGHTS
 # ===============================
 if not filtered_df.empty:
-    total_sales = filtered_df["Total Sales"].sum()
-    total_profit = filtered_df["Total Profit"].sum()
-    avg_margin = (total_profit / total_sales * 100) if total_sales > 0 else 0
+    total_sales, total_profit, avg_margin = insights
 
     st.subheader("📈 Key Insights")
     c1, c2, c3 = st.columns(3)
@@ -161,13 +182,16 @@ else:
 st.subheader("📋 Item-wise Sales, Profit & Margin")
 
 if not filtered_df.empty:
-    st.dataframe(
-        filtered_df[["Outlet", "Category","Item Code", "Items", "Total Sales", "Total Profit", "Margin %"]]
-        .sort_values(by="Margin %", ascending=True)
-        .reset_index(drop=True),
-        use_container_width=True,
-        height=450
-    )
+    with stage("render"):
+        paged_dataframe(
+            df,
+            filtered_df,
+            ["Outlet", "Category", "Item Code", "Items", "Total Sales", "Total Profit", "Margin %"],
+            get_sort_index(df),
+            sort_by="Margin %",
+            ascending=True,
+            key="items",
+        )
 
 # ===============================
 # OUTLET-WISE TOTALS
@@ -175,15 +199,53 @@ if not filtered_df.empty:
 st.subheader("🏪 Outlet-wise Total Sales, Profit & Avg Margin")
 
 if not filtered_df.empty:
-    outlet_summary = (
-        filtered_df.groupby("Outlet")
-        .agg({"Total Sales": "sum", "Total Profit": "sum"})
-        .reset_index()
+    with stage("render"):
+        st.dataframe(outlet_summary, use_container_width=True, height=350)
+else:
+    st.info("No outlet data to display.")
+
+# ===============================
+# OUTLET VARIANCE
+# ===============================
+# Items aligned on Item Code across outlets; follows the sidebar
+# category, exclusion and margin filters but not the outlet one
+st.subheader("📉 Outlet Variance & Top Movers")
+
+outlet_names = sorted(df["Outlet"].unique().tolist())
+v1, v2 = st.columns(2)
+variance_outlet = v1.selectbox(
+    "Outlet", outlet_names,
+    index=outlet_names.index(selected_outlet) if selected_outlet in outlet_names else 0,
+)
+variance_base = v2.selectbox("Compare against", [NETWORK] + [o for o in outlet_names if o != variance_outlet])
+
+
+def outlet_variance():
+    """Effect totals and top movers of the chosen outlet against its comparison."""
+    if selected_category == "All" and not exclude_categories and selected_margin == "All":
+        engine = get_variance_engine(df)
+    else:
+        engine = VarianceEngine(get_filter_engine(df).apply(**dict(selection, outlet="All")))
+    table = engine.compare(variance_base, variance_outlet)
+    return effect_totals(table), top_movers(table)
+
+
+with stage("aggregate"):
+    effects, movers = results.get_or_compute(
+        ("variance", variance_base, variance_outlet)
+        + filter_key(selected_category, exclude_categories, margin=selected_margin),
+        outlet_variance,
     )
-    # Correct avg margin using total profit/total sales
-    outlet_summary["Avg Margin %"] = (outlet_summary["Total Profit"] / outlet_summary["Total Sales"] * 100).round(2)
-    outlet_summary = outlet_summary.sort_values("Total Sales", ascending=False)
 
-    st.dataframe(outlet_summary, use_container_width=True, height=350)
+if not movers.empty:
+    e1, e2, e3, e4 = st.columns(4)
+    e1.metric("Δ Profit", f"{effects['Δ Profit']:,.2f}")
+    e2.metric("📦 Volume Effect", f"{effects['Volume Effect']:,.2f}")
+    e3.metric("🔀 Mix Effect", f"{effects['Mix Effect']:,.2f}")
+    e4.metric("⚙️ Margin Effect", f"{effects['Margin Effect']:,.2f}")
+    with stage("render"):
+        st.dataframe(movers, use_container_width=True, height=400)
 else:
-    st.info("No outlet data to display.")
+    st.info("No items to compare for the selected filters.")
+
+profile_panel(profile)